@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""ACI/NDO IaC -
+Micro-benchmarks for the Workbook processing hot paths.
+It uses argparse to take in the following CLI arguments:
+    benchmark:       Name of the benchmark to run
+    l or leafs:      Number of Leafs in the synthetic Fabric
+    r or rows:       Number of synthetic Worksheet rows
+    wb or workbook:  Workbook the synthetic rows are copied from
+"""
+
+#======================================================
+# Source Modules
+#======================================================
+from contextlib import redirect_stdout
+import argparse
+import easy_functions
+import ezaci
+import gc
+import glob
+import hashlib
+import io
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+#=================================================================
+# Function to Build a Synthetic Worksheet from the Workbook Rows
+#=================================================================
+def synthetic_rows(easy_jsonData, wb, row_count):
+    # Cycle the real Access/Fabric/Tenants rows up to row_count rows
+    rows = []
+    for worksheet, class_init, func_regex in ezaci.validate_map:
+        ws = wb[worksheet]
+        ws_index = easy_functions.index_worksheet(ws, func_regex)
+        for func in ws_index:
+            if not ezaci.handler_schemas[class_init].get(func): continue
+            jsonData = easy_jsonData[ezaci.handler_schemas[class_init][func]]['allOf'][1]['properties']
+            columns = ws_index[func]['columns']
+            for row_num, values in ws_index[func]['rows']:
+                var_dict = dict(zip(columns, values))
+                keys = list(jsonData['required_args']) + list(jsonData['optional_args'])
+                if not all([k in var_dict for k in keys]): continue
+                # Only keep the rows that validate cleanly
+                var_dict.update({'easyDict':{}, 'easy_jsonData':easy_jsonData, 'row_num':row_num, 'ws':ws})
+                if len(easy_functions.validate_errors(jsonData, **var_dict)) == 0:
+                    rows.append((jsonData, var_dict))
+    return [rows[x % len(rows)] for x in range(row_count)]
+
+#=================================================================
+# Benchmark for validate_args
+#=================================================================
+def bench_validate(args, easy_jsonData, wb):
+    rows = synthetic_rows(easy_jsonData, wb, args.rows)
+    print(f'   validate_args over {len(rows)} synthetic rows:')
+
+    # Argument Plans built once per Schema
+    start = time.perf_counter()
+    for jsonData, var_dict in rows:
+        easy_functions.validate_args(jsonData, **var_dict)
+    cached = time.perf_counter() - start
+    print(f'   - cached plans:  {cached:.3f}s ({len(rows) / cached:,.0f} rows/s)')
+
+    # Argument Plans rebuilt for every row, the cost of re-walking the Schema
+    start = time.perf_counter()
+    for jsonData, var_dict in rows:
+        jsonData.plans.clear()
+        easy_functions.validate_args(jsonData, **var_dict)
+    rebuilt = time.perf_counter() - start
+    print(f'   - rebuilt plans: {rebuilt:.3f}s ({len(rows) / rebuilt:,.0f} rows/s)')
+
+#=================================================================
+# Function to Build the easyDict from every Worksheet of the Workbook
+#=================================================================
+def build_easydict(args, easy_jsonData, wb):
+    easyDict = {}
+    easyDict['latest_versions'] = easy_jsonData['easy_aci']['allOf'][1]['properties']['latest_versions']
+    easyDict['wb'] = wb
+    process_list = easy_jsonData['easy_aci']['allOf'][1]['properties']['processes']['enum']
+    with redirect_stdout(io.StringIO()):
+        easyDict = ezaci.process_sites(args, easyDict, easy_jsonData, wb)
+        easyDict, partials = ezaci.process_run(args, easyDict, easy_jsonData, process_list, wb, {})
+    return easyDict
+
+#=================================================================
+# Function to Count the Policies Shared by more than one Site
+#=================================================================
+def shared_policies(easyDict):
+    def walk(value, seen):
+        if isinstance(value, (dict, easy_functions.ez_record)):
+            seen.add(id(value))
+            for v in value.values(): walk(v, seen)
+        elif isinstance(value, list):
+            for v in value: walk(v, seen)
+    site_ids = []
+    for k, v in easyDict['sites'].items():
+        seen = set()
+        walk(v, seen)
+        site_ids.append(seen)
+    total = set().union(*site_ids)
+    return len(total), sum([len(x) for x in site_ids]) - len(total)
+
+#=================================================================
+# Function to Stand in for the Sensitive Variable Prompts
+#=================================================================
+def sensitive_var_value(**kwargs):
+    # The Benchmarks run unattended, without the TF_VAR_* Environment
+    return f'{kwargs["Variable"]}_value'
+
+#=================================================================
+# Function to Run against Copies of the Interface Selector Workbooks
+#=================================================================
+def workbook_run(wb, func):
+    # The Switch Profiles update the Interface Selector Workbooks in the
+    # Working Directory, so run against copies of them
+    script_path = os.path.dirname(os.path.realpath(sys.argv[0]))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for selectors in glob.glob(os.path.join(script_path, '*_interface_selectors.xlsx')):
+            shutil.copy(selectors, tmp_dir)
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        try:
+            run_args = argparse.Namespace(dir = tmp_dir, git_check = False, incremental = False,
+                jobs = 1, skip_version_check = True, workbook = wb.excel_workbook
+            )
+            return func(run_args)
+        finally:
+            os.chdir(cwd)
+
+#=================================================================
+# Benchmark for Building the easyDict
+#=================================================================
+def bench_easydict(args, easy_jsonData, wb):
+    def measure(run_args):
+        # Warm the Schema, Validator and Worksheet caches first
+        build_easydict(run_args, easy_jsonData, wb)
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        easyDict = build_easydict(run_args, easy_jsonData, wb)
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return easyDict, elapsed, current, peak
+
+    easyDict, elapsed, current, peak = workbook_run(wb, measure)
+    policies, shared = shared_policies(easyDict)
+    print(f'   easyDict for {len(easyDict["sites"])} Sites from {os.path.basename(wb.excel_workbook)}:')
+    print(f'   - build time:      {elapsed:.3f}s')
+    print(f'   - retained memory: {current / 1024:,.0f} KiB')
+    print(f'   - peak memory:     {peak / 1024:,.0f} KiB')
+    print(f'   - policies:        {policies:,} ({shared:,} more references shared between Sites)')
+
+#=================================================================
+# Function to Build the Interface Selectors of a Synthetic Fabric
+#=================================================================
+def fabric_selectors(leafs, records):
+    # 48 Ports on every Leaf, added the way intf_selector adds them
+    profiles = []
+    for leaf in range(leafs):
+        interfaces = easy_functions.named_list()
+        for port in range(1, 49):
+            polVars = {
+                'interface':f'1/{port}',
+                'interface_description':f'leaf{201 + leaf} Eth1/{port}',
+                'policy_group':f'access_{port % 4}_apg',
+                'policy_group_type':'access',
+                'site_group':'Grp_A',
+                'sub_port':None
+            }
+            if records: polVars = easy_functions.interface_selector(polVars)
+            polVars.pop('site_group')
+            interfaces.append(easy_functions.ez_remove_empty(polVars))
+        profiles.append({'name':f'leaf{201 + leaf}', 'interfaces':interfaces})
+    return profiles
+
+#=================================================================
+# Function to Measure a Synthetic Fabric in its own Process
+#=================================================================
+def fabric_worker(leafs, records):
+    gc.collect()
+    tracemalloc.start()
+    profiles = fabric_selectors(leafs, records)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stream = yaml_stream(profiles[:4])
+    return {
+        'current':current,
+        'maxrss':resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'yaml':hashlib.sha256(stream.encode('utf-8')).hexdigest()
+    }
+
+#=================================================================
+# Function to Emit Switch Profiles the way create_yaml does
+#=================================================================
+def yaml_stream(profiles):
+    return easy_functions.ez_yaml({'switch':{'switch_profiles':profiles}})
+
+#=================================================================
+# Benchmark for the Slotted Records of a large Fabric
+#=================================================================
+def bench_records(args, easy_jsonData, wb):
+    # Every run gets a new Process, so its peak RSS is its own
+    ctx = multiprocessing.get_context('spawn')
+    results = {}
+    for name, leafs, records in [('baseline', 0, False), ('dict', args.leafs, False), ('record', args.leafs, True)]:
+        with ctx.Pool(1) as pool:
+            results[name] = pool.apply(fabric_worker, (leafs, records))
+    base = results['baseline']['maxrss']
+    print(f'   Interface Selectors of a {args.leafs} Leaf Fabric ({args.leafs * 48:,} Selectors):')
+    for name in ['dict', 'record']:
+        print(f'   - {name + ":":8} retained {results[name]["current"] / 1024:,.0f} KiB, peak RSS'
+            f' {results[name]["maxrss"] / 1024:,.1f} MiB (+{(results[name]["maxrss"] - base) / 1024:,.1f} MiB'
+            f' over an empty Process)'
+        )
+    # Peak RSS moves in whole allocator arenas, so the retained bytes of the
+    # Selectors are the measure; small Fabrics show no RSS change at all
+    saved = results['dict']['current'] - results['record']['current']
+    print(f'   - retained memory reduction: {saved / 1024:,.0f} KiB'
+        f' ({saved / max(results["dict"]["current"], 1):.0%} of the Selector memory)')
+    print(f'   - peak RSS reduction: {(results["dict"]["maxrss"] - results["record"]["maxrss"]) / 1024:,.1f} MiB')
+    if results['dict']['yaml'] == results['record']['yaml']: print(f'   - YAML output: identical')
+    else: print(f'   - YAML output: DIFFERENT')
+
+#=================================================================
+# Benchmark for the YAML Emitters
+#=================================================================
+def bench_yaml(args, easy_jsonData, wb):
+    # The pure Python yaml.Dumper with the List items spaced afterwards,
+    # the way create_yaml emitted the YAML before
+    class legacy_dumper(easy_functions.yaml.Dumper):
+        def ignore_aliases(self, data):
+            return True
+    representer = easy_functions.yaml.representer.SafeRepresenter
+    legacy_dumper.add_representer(easy_functions.named_list, representer.represent_list)
+    legacy_dumper.add_multi_representer(easy_functions.ez_record, representer.represent_dict)
+    def legacy(data):
+        stream = easy_functions.yaml.dump(data, Dumper=legacy_dumper, default_flow_style=False)
+        return stream.replace('\n- ', '\n\n- ')
+
+    # Every class of every Site of the Workbook, and the Switch Profiles of
+    # a synthetic Fabric, one Document per Switch
+    easyDict = workbook_run(wb, lambda run_args: build_easydict(run_args, easy_jsonData, wb))
+    documents = []
+    for site in easyDict['sites'].values():
+        for k, v in site.items():
+            if v and not k in ['sensitive_vars', 'site_settings']: documents.append({k:v})
+    for profile in fabric_selectors(args.leafs, True):
+        documents.append({'switch':{'switch_profiles':{profile['name']:profile}}})
+
+    emitters = [('yaml.Dumper + replace', legacy), ('ez_yaml, Python', lambda x: easy_functions.ez_yaml(x, False))]
+    if easy_functions.yaml.__with_libyaml__:
+        emitters.append(('ez_yaml, libyaml', lambda x: easy_functions.ez_yaml(x, True)))
+    else: print('   PyYAML was built without libyaml, only the Python Emitter is measured.')
+    print(f'   YAML for {len(documents):,} Documents ({args.leafs} Leaf synthetic Fabric):')
+    outputs = {}
+    for name, emitter in emitters:
+        start = time.perf_counter()
+        outputs[name] = [emitter(x) for x in documents]
+        elapsed = time.perf_counter() - start
+        size = sum([len(x) for x in outputs[name]])
+        if outputs[name] == outputs[emitters[0][0]]: same = 'byte-identical'
+        else: same = 'DIFFERENT'
+        print(f'   - {name + ":":23} {elapsed:.3f}s ({size / elapsed / 1024 / 1024:,.1f} MiB/s), {same}')
+
+#=================================================================
+# The Main Module
+#=================================================================
+def main():
+    benchmarks = {
+        'easydict': bench_easydict, 'records': bench_records, 'validate': bench_validate, 'yaml': bench_yaml
+    }
+    Parser = argparse.ArgumentParser(description='IaC Easy ACI Benchmarks')
+    Parser.add_argument('benchmark', choices = sorted(benchmarks.keys()),
+        help = 'The benchmark to run.'
+    )
+    Parser.add_argument('-l', '--leafs',
+        default = 400, type = int,
+        help = 'Number of Leafs in the synthetic Fabric.'
+    )
+    Parser.add_argument('-r', '--rows',
+        default = 10000, type = int,
+        help = 'Number of synthetic Worksheet rows.'
+    )
+    Parser.add_argument('-wb', '--workbook',
+        default = 'ACI_Base_Workbookv3.xlsx',
+        help = 'The Workbook the synthetic rows are copied from.'
+    )
+    args = Parser.parse_args()
+    args.workbook = os.path.abspath(args.workbook)
+    easy_functions.sensitive_var_value = sensitive_var_value
+
+    script_path = os.path.dirname(os.path.realpath(sys.argv[0]))
+    jsonFile = os.path.join(script_path, 'templates', 'variables', 'easy_variables.json')
+    easy_jsonData = easy_functions.schema_bundle(jsonFile)
+    wb = easy_functions.workbook_cache(args.workbook, os.path.join(os.path.expanduser('~'), '.easy_aci', 'cache'), 64)
+    print(f'\n-----------------------------------------------------------------------------\n')
+    benchmarks[args.benchmark](args, easy_jsonData, wb)
+    print(f'\n-----------------------------------------------------------------------------\n')
+    wb.close()
+
+if __name__ == '__main__':
+    main()
@@ -8,10 +8,8 @@ from collections import OrderedDict
 from openpyxl import load_workbook
 from requests.api import delete
 import easy_functions
-import jinja2
 import json
 import os
-import pkg_resources
 import re
 import requests
 import stdiomask
@@ -28,9 +26,6 @@ print_response_on_fail = True
 # Log levels 0 = None, 1 = Class only, 2 = Line
 log_level = 2
 
-# Global path to main Template directory
-template_path = pkg_resources.resource_filename('classes', 'templates/')
-
 class LoginFailed(Exception):
     pass
 
@@ -335,7 +330,7 @@ class access(object):
         remove_temp = kwargs['easyDict']['remove_default_args']
         kwargs['easyDict']['remove_default_args'] = False
         polVars = easy_functions.process_kwargs(jsonData, **kwargs)
-        kwargs['easyDict']['remove_default_args'] == remove_temp
+        kwargs['easyDict']['remove_default_args'] = remove_temp
         
         # Add Policy Variables to easyDict
         kwargs['class_path'] = 'access,policies,interface,create_pre_built_interface_policies'
@@ -370,26 +365,26 @@ class access(object):
         polVars['encap_blocks'] = []
         if not polVars.get('vlan_group1') == None:
             if not polVars.get('vlan_group1_allocation') == None:
-                polVars['encap_blocks'].append({
-                    'allocation_mode':polVars['vlan_group1_allocation'],
-                    'vlan_range':polVars['vlan_group1'],
-                })
+                polVars['encap_blocks'].append(easy_functions.encap_block(
+                    allocation_mode = polVars['vlan_group1_allocation'],
+                    vlan_range = polVars['vlan_group1']
+                ))
             else:
-                polVars['encap_blocks'].append({
-                    'allocation_mode':'inherit',
-                    'vlan_range':polVars['vlan_group1'],
-                })
+                polVars['encap_blocks'].append(easy_functions.encap_block(
+                    allocation_mode = 'inherit',
+                    vlan_range = polVars['vlan_group1']
+                ))
         if not polVars.get('vlan_group2') == None:
             if not polVars.get('vlan_group2_allocation') == None:
-                polVars['encap_blocks'].append({
-                    'allocation_mode':polVars['vlan_group2_allocation'],
-                    'vlan_range':polVars['vlan_group2'],
-                })
+                polVars['encap_blocks'].append(easy_functions.encap_block(
+                    allocation_mode = polVars['vlan_group2_allocation'],
+                    vlan_range = polVars['vlan_group2']
+                ))
             else:
-                polVars['encap_blocks'].append({
-                    'allocation_mode':'inherit',
-                    'vlan_range':polVars['vlan_group2'],
-                })
+                polVars['encap_blocks'].append(easy_functions.encap_block(
+                    allocation_mode = 'inherit',
+                    vlan_range = polVars['vlan_group2']
+                ))
         pop_list = ['vlan_group1', 'vlan_group1_allocation', 'vlan_group2', 'vlan_group2_allocation']
         for i in pop_list:
             if not polVars.get(i) == None: polVars.pop(i)
@@ -1189,7 +1184,7 @@ class fabric(object):
         remove_temp = kwargs['easyDict']['remove_default_args']
         kwargs['easyDict']['remove_default_args'] = False
         polVars = easy_functions.process_kwargs(jsonData, **kwargs)
-        kwargs['easyDict']['remove_default_args'] == remove_temp
+        kwargs['easyDict']['remove_default_args'] = remove_temp
         
         # Add Policy Variables to easyDict
         kwargs['class_path'] = 'fabric,recommended_settings'
@@ -1262,9 +1257,7 @@ class ndoLogin(object):
 class switches(object):
     def __init__(self, type):
         self.type = type
-        self.templateLoader = jinja2.FileSystemLoader(
-            searchpath=(template_path + 'switches/'))
-        self.templateEnv = jinja2.Environment(loader=self.templateLoader)
+        self.templateEnv = easy_functions.template_env('switches')
     #=============================================================================
     # Function - Interface Selectors
     #=============================================================================
@@ -1287,6 +1280,7 @@ class switches(object):
         if pgt == 'spine_pg': polVars.pop('policy_group_type')
 
         # Add Policy Variables to easyDict
+        polVars = easy_functions.interface_selector(polVars)
         kwargs['class_path'] = 'switch,switch_profiles,interfaces'
         kwargs['policy'] = 'name'
         kwargs['policy_name'] = kwargs['interface_profile']
@@ -1390,12 +1384,12 @@ class switches(object):
             if not polVars['vpc_name'] == None:
                 if kwargs['easyDict']['sites'][kwargs['site_group']]['switch'].get('vpc_domains'):
                     if len(kwargs['easyDict']['sites'][kwargs['site_group']]['switch']['vpc_domains']) > 0:
-                        vpc_count = 0
-                        for i in kwargs['easyDict']['sites'][kwargs['site_group']]['switch']['vpc_domains']:
-                            if i['name'] == polVars['vpc_name']:
-                                i['switches'].append(polVars['node_id'])
-                                vpc_count =+ 1
-                        if vpc_count == 0:
+                        vpc_domain = easy_functions.ez_policy(kwargs['easyDict']['sites'][kwargs['site_group']]['switch'],
+                            'vpc_domains', 'name', polVars['vpc_name']
+                        )
+                        if vpc_domain:
+                            vpc_domain['switches'].append(polVars['node_id'])
+                        else:
                             # Add Policy Variables to easyDict
                             vpcArgs = {
                                 'name':polVars['vpc_name'],
@@ -1479,21 +1473,17 @@ class switches(object):
 
         # Evaluate The Interface Selectors Worksheet in the Site Workbook
         wb = kwargs['wb_sw']
-        class_init = 'switches'
         class_folder = 'switches'
         func_regex = '^intf_selector$'
         ws = wb[f"{polVars['switch_name']}"]
-        rows = ws.max_row
-        func_list = easy_functions.findKeys(ws, func_regex)
+        ws_index = easy_functions.index_worksheet(ws, func_regex)
         easy_functions.stdout_log(ws, None, 'begin')
-        for func in func_list:
-            count = easy_functions.countKeys(ws, func)
-            var_dict = easy_functions.findVars(ws, func, rows, count)
-            for pos in var_dict:
-                row_num = var_dict[pos]['row']
-                del var_dict[pos]['row']
+        for func in ws_index:
+            columns = ws_index[func]['columns']
+            for row_num, values in ws_index[func]['rows']:
+                var_dict = dict(zip(columns, values))
                 easy_functions.stdout_log(ws, row_num, 'begin')
-                var_dict[pos].update(
+                var_dict.update(
                     {
                         'class_folder':class_folder,
                         'easyDict':kwargs['easyDict'],
@@ -1503,7 +1493,7 @@ class switches(object):
                         'ws':ws
                     }
                 )
-                easyDict = eval(f"{class_init}(class_folder).{func}(**var_dict[pos])")
+                easyDict = self.intf_selector(**var_dict)
 
         # Set the wb and ws back
         kwargs['wb'] = wb
@@ -1617,8 +1607,7 @@ class site_policies(object):
         if polVars['controller_type'] == 'apic': 
             site_wb = '%s_interface_selectors.xlsx' % (kwargs['site_name'])
             if not os.path.isfile(site_wb):
-                kwargs['wb'].save(filename=site_wb)
-                wb_wr = load_workbook(site_wb)
+                wb_wr = easy_functions.read_in(args.workbook, read_only=False)
                 ws_wr = wb_wr.get_sheet_names()
                 for sheetName in ws_wr:
                     if sheetName not in ['Sites']:
@@ -1632,7 +1621,8 @@ class site_policies(object):
             kwargs['easyDict'].update(deepcopy({'sites':{}}))
         if not kwargs['easyDict'].get('tmp'):
             kwargs['easyDict'].update(deepcopy({'tmp':{}}))
-        kwargs['easyDict']['sites'].update(deepcopy({polVars['site_id']:siteDict}))
+        # Site Group rows are queued on the Site until a key is read
+        kwargs['easyDict']['sites'].update({polVars['site_id']:easy_functions.site_dict(deepcopy(siteDict))})
         
         # Attach the Site Settings
         kwargs['easyDict']['sites'][polVars['site_id']]['site_settings'].update(deepcopy(polVars))
@@ -1805,7 +1795,7 @@ class system_settings(object):
         remove_temp = kwargs['easyDict']['remove_default_args']
         kwargs['easyDict']['remove_default_args'] = False
         polVars = easy_functions.process_kwargs(jsonData, **kwargs)
-        kwargs['easyDict']['remove_default_args'] == remove_temp
+        kwargs['easyDict']['remove_default_args'] = remove_temp
         
         # Check if the Sensitive Variables are in the Environment.  If not Add them.
         if kwargs['global_aes_encryption_settings'] == True:
@@ -1950,7 +1940,7 @@ class tenants(object):
         remove_temp = kwargs['easyDict']['remove_default_args']
         kwargs['easyDict']['remove_default_args'] = False
         polVars = easy_functions.process_kwargs(jsonData, **kwargs)
-        kwargs['easyDict']['remove_default_args'] == remove_temp
+        kwargs['easyDict']['remove_default_args'] = remove_temp
 
         # Remove Items in the Pop List
         jsonData = easy_functions.args_remove(args_list, jsonData)
@@ -2049,7 +2039,7 @@ class tenants(object):
         remove_temp = kwargs['easyDict']['remove_default_args']
         kwargs['easyDict']['remove_default_args'] = False
         polVars = easy_functions.process_kwargs(jsonData, **kwargs)
-        kwargs['easyDict']['remove_default_args'] == remove_temp
+        kwargs['easyDict']['remove_default_args'] = remove_temp
 
         # Modify the polVars scope and subnet_control
         polVars['scope'] = {
@@ -2382,7 +2372,8 @@ class tenants(object):
                     tempcount += 1
             if tempcount == 0:
                 validating.error_template_not_found('epg_template', **kwargs)
-            return epg_template
+            # The Template values become part of the new EPG row
+            return easy_functions.ez_thaw(epg_template)
         if 'Grp_' in kwargs['site_group']:
             if kwargs['easyDict']['site_groups'].get(kwargs['site_group']):
                 sites = kwargs['easyDict']['site_groups'][kwargs['site_group']]['sites']
@@ -2445,7 +2436,7 @@ class tenants(object):
         remove_temp = kwargs['easyDict']['remove_default_args']
         kwargs['easyDict']['remove_default_args'] = False
         polVars = easy_functions.process_kwargs(jsonData, **kwargs)
-        kwargs['easyDict']['remove_default_args'] == remove_temp
+        kwargs['easyDict']['remove_default_args'] = remove_temp
         polVars['epg_type'] = kwargs['epg_type']
 
         # Remove Items in the Pop List
@@ -2686,6 +2677,7 @@ class tenants(object):
             if not polVars.get(i) == None: polVars.pop(i)
 
         # Add Dictionary to Policy
+        polVars = easy_functions.filter_entry(polVars)
         kwargs['class_path'] = 'contracts,filters,filter_entries'
         kwargs['policy'] = 'name'
         kwargs['policy_name'] = kwargs['filter_name']
@@ -3213,9 +3205,7 @@ class tenants(object):
 #=====================================================================================
 class terraform_cloud(object):
     def __init__(self):
-        self.templateLoader = jinja2.FileSystemLoader(
-            searchpath=(template_path + 'terraform/'))
-        self.templateEnv = jinja2.Environment(loader=self.templateLoader)
+        self.templateEnv = easy_functions.template_env('terraform')
 
     #=============================================================================
     # Function - Create Terraform Cloud Workspaces
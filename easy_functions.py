@@ -3,16 +3,22 @@
 #========================================================
 # Source Modules
 #========================================================
-from copy import deepcopy
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stdout
 from openpyxl import load_workbook
 from openpyxl.worksheet.datavalidation import DataValidation
-from ordered_set import OrderedSet
 from textwrap import fill
+import filecmp
 import git
+import hashlib
+import io
 import jinja2
 import json
+import mmap
 import openpyxl
 import os
+import pickle
 import pkg_resources
 import platform
 import re
@@ -21,9 +27,12 @@ import shutil
 import subprocess
 import sys
 import stdiomask
+import struct
+import threading
 import time
 import validating
 import yaml
+import zlib
 
 # Global options for debugging
 print_payload = False
@@ -35,12 +44,586 @@ print_response_on_fail = True
 #========================================================
 log_level = 2
 
+#========================================================
+# Arguments Validated against the globalData Schema
+#========================================================
+global_args = frozenset([
+    'admin_state',
+    'application_epg',
+    'application_profile',
+    'annotation',
+    'annotations',
+    'audit_logs',
+    'bridge_domain',
+    'cdp_interface_policy',
+    'description',
+    'events',
+    'faults',
+    'global_alias',
+    'l3out',
+    'lldp_interface_policy',
+    'login_domain',
+    'management_epg',
+    'management_epg_type',
+    'monitoring_policy',
+    'name',
+    'name_alias',
+    'node_id',
+    'pod_id',
+    'policies_tenant',
+    'policy_name',
+    'profile_name',
+    'port_channel_policy',
+    'qos_class',
+    'schema',
+    'session_logs',
+    'sites',
+    'target_dscp',
+    'template',
+    'tenant',
+    'username',
+    'vrf'
+])
+
 #========================================================
 # Exception Classes
 #========================================================
 class InsufficientArgs(Exception):
     pass
 
+class ValidationComplete(Exception):
+    # Raised by process_kwargs with the Errors of the Row when only Validating
+    def __init__(self, errors):
+        Exception.__init__(self, errors)
+        self.errors = errors
+
+#========================================================
+# Parsed Workbook Cache
+#========================================================
+# Bump when the layout of the cached row data changes
+cache_format = 1
+
+class cached_worksheet(object):
+    def __init__(self, title, rows):
+        self.title = title
+        self.rows = rows
+
+    def iter_rows(self, min_row=1, max_col=None, values_only=True):
+        for row in self.rows[min_row - 1:]:
+            yield row[:max_col]
+
+class workbook_cache(object):
+    def __init__(self, excel_workbook, cache_dir, cache_size):
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size * 1024 * 1024
+        self.excel_workbook = excel_workbook
+        self.sha256 = file_sha256(excel_workbook)
+        self.wb = None
+        self.worksheets = {}
+
+    def __getitem__(self, sheet):
+        if not sheet in self.worksheets:
+            sheet_hash = hashlib.sha256(sheet.encode('utf-8')).hexdigest()[:16]
+            cache_file = os.path.join(self.cache_dir, f'{self.sha256}_{sheet_hash}.cache')
+            ws = None
+            if self.cache_size > 0 and os.path.isfile(cache_file):
+                ws = self.load(cache_file)
+            if ws == None:
+                if self.wb == None:
+                    self.wb = read_in(self.excel_workbook)
+                rows = tuple(self.wb[sheet].iter_rows(min_row=1, max_col=35, values_only=True))
+                ws = cached_worksheet(sheet, rows)
+                if self.cache_size > 0:
+                    self.save(cache_file, ws)
+            self.worksheets[sheet] = ws
+        return self.worksheets[sheet]
+
+    def __getstate__(self):
+        # The open Workbook stays with the Process that loaded it
+        state = dict(self.__dict__)
+        state['wb'] = None
+        return state
+
+    def close(self):
+        if not self.wb == None:
+            self.wb.close()
+            self.wb = None
+
+    def evict(self):
+        # Remove the least recently used entries until the cache fits in cache_size
+        cache_files = []
+        for f in os.listdir(self.cache_dir):
+            if f.endswith('.cache'):
+                fstat = os.stat(os.path.join(self.cache_dir, f))
+                cache_files.append((fstat.st_mtime, fstat.st_size, f))
+        cache_files.sort()
+        total_size = sum([i[1] for i in cache_files])
+        for mtime, size, f in cache_files:
+            if total_size <= self.cache_size:
+                break
+            os.remove(os.path.join(self.cache_dir, f))
+            total_size -= size
+
+    def load(self, cache_file):
+        try:
+            with open(cache_file, 'rb') as fh:
+                cache = pickle.loads(zlib.decompress(fh.read()))
+            os.utime(cache_file)
+        except Exception:
+            return None
+        if not cache.get('format') == cache_format:
+            return None
+        return cached_worksheet(cache['title'], cache['rows'])
+
+    def save(self, cache_file, ws):
+        cache = {'format':cache_format, 'title':ws.title, 'rows':ws.rows}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(cache_file + '.tmp', 'wb') as fh:
+            fh.write(zlib.compress(pickle.dumps(cache, protocol=pickle.HIGHEST_PROTOCOL)))
+        os.replace(cache_file + '.tmp', cache_file)
+        self.evict()
+
+#========================================================
+# Indexed easy_variables Schema Bundle
+#========================================================
+# Bump when the layout of the bundle or the compiled Schema changes
+schema_format = 3
+schema_header = struct.Struct('>8sI64sQ')
+
+class schema_bundle(object):
+    # Each compiled Schema is pickled on its own into one file with an index
+    # of offsets.  The file is memory mapped and a Schema is only unpickled
+    # the first time it is looked up by name.
+    def __init__(self, jsonFile):
+        self.bundle_file = os.path.splitext(jsonFile)[0] + '.bundle'
+        self.jsonFile = jsonFile
+        self.sha256 = file_sha256(jsonFile)
+        self.schemas = {}
+        if not self.load():
+            self.build()
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __getitem__(self, name):
+        if not name in self.schemas:
+            offset, length = self.index[name]
+            self.schemas[name] = pickle.loads(self.mm[offset:offset + length])
+        return self.schemas[name]
+
+    def __getstate__(self):
+        # Worker Processes map the bundle again rather than copy the Schemas
+        return {'bundle_file':self.bundle_file, 'jsonFile':self.jsonFile, 'sha256':self.sha256}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.schemas = {}
+        if not self.load():
+            self.build()
+
+    def build(self):
+        with open(self.jsonFile, 'r') as fh:
+            self.schemas = validating.compile_schema(json.load(fh))['components']['schemas']
+        self.index = dict.fromkeys(self.schemas.keys())
+        try:
+            with open(self.bundle_file + '.tmp', 'wb') as fh:
+                fh.write(b'\0' * schema_header.size)
+                index = {}
+                for name, schema in self.schemas.items():
+                    data = pickle.dumps(schema, protocol=pickle.HIGHEST_PROTOCOL)
+                    index[name] = (fh.tell(), len(data))
+                    fh.write(data)
+                index_offset = fh.tell()
+                fh.write(pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL))
+                fh.seek(0)
+                fh.write(schema_header.pack(b'EZSCHEMA', schema_format, self.sha256.encode(), index_offset))
+            os.replace(self.bundle_file + '.tmp', self.bundle_file)
+        except OSError:
+            # Without a writable bundle the Schemas just stay in memory
+            pass
+
+    def keys(self):
+        return self.index.keys()
+
+    def load(self):
+        try:
+            with open(self.bundle_file, 'rb') as fh:
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        if len(mm) < schema_header.size:
+            mm.close()
+            return False
+        magic, bundle_format, sha256, index_offset = schema_header.unpack_from(mm, 0)
+        if not (magic == b'EZSCHEMA' and bundle_format == schema_format and sha256.decode() == self.sha256):
+            mm.close()
+            return False
+        self.index = pickle.loads(mm[index_offset:])
+        self.mm = mm
+        return True
+
+#========================================================
+# Name Indexed easyDict Policy List
+#========================================================
+# Ownership of the easyDict Policies:
+#  - a row's polVars is built once by the Handler and handed to an ez_*
+#    function, which appends it by reference, to every Site of a Site Group
+#  - from then on the row is frozen, nothing changes it in place
+#  - a row is only changed through own(), which swaps in the Site's private
+#    copy the first time, so the other Sites keep the frozen row
+class named_list(list):
+    # Keeps a key -> value -> position Side Index, built on first lookup
+    # of a key and kept current on append.  The first Policy wins, the
+    # same as the list scans it replaces.  Both are only created when used
+    __slots__ = ('indexes', 'owned')
+
+    def __init__(self, *args):
+        list.__init__(self, *args)
+        self.indexes = None
+        self.owned = None
+
+    def __reduce__(self):
+        return (named_list, (list(self),), self.owned)
+
+    def __setstate__(self, owned):
+        self.owned = owned
+
+    def append(self, item):
+        list.append(self, item)
+        if self.indexes:
+            for key, index in self.indexes.items():
+                if key in item: index.setdefault(item[key], len(self) - 1)
+
+    def extend(self, items):
+        for item in items: self.append(item)
+
+    def find(self, key, value):
+        if self.indexes == None: self.indexes = {}
+        if not key in self.indexes:
+            index = {}
+            for position, item in enumerate(self):
+                if key in item: index.setdefault(item[key], position)
+            self.indexes[key] = index
+        return self.indexes[key].get(value)
+
+    def own(self, position):
+        if self.owned == None: self.owned = set()
+        if not position in self.owned:
+            list.__setitem__(self, position, ez_thaw(self[position]))
+            self.owned.add(position)
+        return self[position]
+
+    def reindex(self):
+        # The positions moved, so forget what was owned as well
+        self.indexes = None
+        self.owned = None
+
+    def __delitem__(self, *args):
+        list.__delitem__(self, *args)
+        self.reindex()
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __setitem__(self, *args):
+        list.__setitem__(self, *args)
+        self.reindex()
+
+    def insert(self, *args):
+        list.insert(self, *args)
+        self.reindex()
+
+    def pop(self, *args):
+        item = list.pop(self, *args)
+        self.reindex()
+        return item
+
+    def remove(self, *args):
+        list.remove(self, *args)
+        self.reindex()
+
+    def reverse(self):
+        list.reverse(self)
+        self.reindex()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self.reindex()
+
+#========================================================
+# Slotted easyDict Record
+#========================================================
+# The Policies a large Fabric has thousands of (Interface Selectors,
+# Filter Entries, VLAN Encap Blocks) are kept as Records instead of
+# Dictionaries.  A Record is a Mapping over a fixed set of fields held in
+# __slots__, with an extra Dictionary only for keys outside the fields.
+# The Strings are interned, so the Policy Group and Allocation names
+# repeated on every port are stored once
+class ez_record(MutableMapping):
+    __slots__ = ('extra',)
+    fields = ()
+
+    def __init__(self, *args, **kwargs):
+        self.extra = None
+        self.update(*args, **kwargs)
+
+    def __reduce__(self):
+        return (self.__class__, (list(self.items()),))
+
+    def __delitem__(self, key):
+        if key in self.fields:
+            if not hasattr(self, key): raise KeyError(key)
+            delattr(self, key)
+        elif self.extra and key in self.extra:
+            del self.extra[key]
+        else: raise KeyError(key)
+
+    def __getitem__(self, key):
+        if key in self.fields:
+            if hasattr(self, key): return getattr(self, key)
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key in self.fields:
+            if hasattr(self, key): yield key
+        if self.extra:
+            for key in self.extra: yield key
+
+    def __len__(self):
+        return len([key for key in self.fields if hasattr(self, key)]) + len(self.extra or ())
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __setitem__(self, key, value):
+        if isinstance(value, str): value = sys.intern(value)
+        if key in self.fields: setattr(self, key, value)
+        else:
+            if self.extra == None: self.extra = {}
+            self.extra[key] = value
+
+class encap_block(ez_record):
+    __slots__ = fields = ('allocation_mode', 'vlan_range')
+
+class filter_entry(ez_record):
+    __slots__ = fields = (
+        'alias', 'arp_flag', 'description', 'destination_port_from', 'destination_port_to', 'ethertype',
+        'global_alias', 'icmpv4_type', 'icmpv6_type', 'ip_protocol', 'match_dscp', 'match_only_fragments',
+        'name', 'site_group', 'source_port_from', 'source_port_to', 'stateful', 'tcp_session_rules'
+    )
+
+class interface_selector(ez_record):
+    __slots__ = fields = (
+        'interface', 'interface_description', 'policy_group', 'policy_group_type', 'site_group', 'sub_port'
+    )
+
+#========================================================
+# easyDict Site with Deferred Site Group Rows
+#========================================================
+# Site Group rows are validated once and queued, by reference, on every
+# Site of the Group under the top level key they change.  A Site applies
+# the queued rows of a key, in Workbook order, the first time that key is
+# read or written, so the Group rows and the Site rows stay in order
+class site_dict(dict):
+    __slots__ = ('pending',)
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.pending = {}
+
+    def __reduce__(self):
+        self.materialize()
+        return (site_dict, (dict(dict.items(self)),))
+
+    def defer(self, key, apply):
+        self.pending.setdefault(key, []).append(apply)
+
+    def materialize(self, key=None):
+        if key == None:
+            for key in list(self.pending.keys()): self.materialize(key)
+        elif key in self.pending:
+            for apply in self.pending.pop(key): apply(self)
+
+    def __contains__(self, key):
+        self.materialize(key)
+        return dict.__contains__(self, key)
+
+    def __delitem__(self, key):
+        self.materialize(key)
+        dict.__delitem__(self, key)
+
+    def __eq__(self, other):
+        self.materialize()
+        return dict.__eq__(self, other)
+
+    def __getitem__(self, key):
+        self.materialize(key)
+        return dict.__getitem__(self, key)
+
+    def __iter__(self):
+        self.materialize()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self.materialize()
+        return dict.__len__(self)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        self.materialize()
+        return dict.__repr__(self)
+
+    def __setitem__(self, key, value):
+        self.materialize(key)
+        dict.__setitem__(self, key, value)
+
+    def copy(self):
+        self.materialize()
+        return site_dict(dict.items(self))
+
+    def get(self, key, default=None):
+        self.materialize(key)
+        return dict.get(self, key, default)
+
+    def items(self):
+        self.materialize()
+        return dict.items(self)
+
+    def keys(self):
+        self.materialize()
+        return dict.keys(self)
+
+    def pop(self, key, *args):
+        self.materialize(key)
+        return dict.pop(self, key, *args)
+
+    def setdefault(self, key, default=None):
+        self.materialize(key)
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        self.materialize()
+        dict.update(self, *args, **kwargs)
+
+    def values(self):
+        self.materialize()
+        return dict.values(self)
+
+#========================================================
+# easyDict YAML Emitters
+#========================================================
+# The YAML files are emitted with libyaml's CSafeDumper when PyYAML was
+# built with it, and with the pure Python SafeDumper when it was not.
+# Both put a blank line before every List item at column 0
+class ez_python_dumper(yaml.SafeDumper):
+    # Rows are shared by reference, write them out in full every time
+    def ignore_aliases(self, data):
+        return True
+
+    def expect_block_sequence_item(self, first=False):
+        if not first and isinstance(self.event, yaml.SequenceEndEvent):
+            self.indent = self.indents.pop()
+            self.state = self.states.pop()
+        else:
+            line = self.line
+            self.write_indent()
+            if self.indent == 0 and self.line > line: self.write_line_break()
+            self.write_indicator('-', True, indention=True)
+            self.states.append(self.expect_block_sequence_item)
+            self.expect_node(sequence=True)
+
+class ez_libyaml_fallback(Exception):
+    pass
+
+ez_dumpers = [ez_python_dumper]
+if yaml.__with_libyaml__:
+    class ez_libyaml_dumper(yaml.CSafeDumper):
+        def ignore_aliases(self, data):
+            return True
+
+        def represent_str(self, data):
+            # libyaml folds long double quoted Strings at other points than
+            # the Python Emitter, so the Strings that may need double quotes
+            # are left to the Python Emitter
+            if not (data.isascii() and data.isprintable()): raise ez_libyaml_fallback()
+            return yaml.representer.SafeRepresenter.represent_str(self, data)
+
+    ez_libyaml_dumper.add_representer(str, ez_libyaml_dumper.represent_str)
+    ez_dumpers.append(ez_libyaml_dumper)
+
+# Emit the easyDict types as plain YAML Sequences and Mappings
+for dumper in ez_dumpers:
+    dumper.add_representer(named_list, yaml.representer.SafeRepresenter.represent_list)
+    dumper.add_multi_representer(ez_record, yaml.representer.SafeRepresenter.represent_dict)
+    dumper.add_representer(site_dict, yaml.representer.SafeRepresenter.represent_dict)
+
+class ez_spaced_stream(object):
+    # The libyaml Emitter can not be extended, so the blank lines are added
+    # to its output as it is written.  Everything up to the last line break
+    # is final, the rest waits for the next write
+    def __init__(self):
+        self.parts = []
+        self.pending = ''
+
+    def write(self, data):
+        data = self.pending + data
+        end = data.rfind('\n')
+        if end < 0:
+            self.pending = data
+            return
+        self.parts.append(data[:end].replace('\n- ', '\n\n- '))
+        self.pending = data[end:]
+
+    def getvalue(self):
+        return ''.join(self.parts) + self.pending.replace('\n- ', '\n\n- ')
+
+#========================================================
+# Compiled easyDict class_path
+#========================================================
+class easy_path(object):
+    # The keys of a class_path String, split once for all the rows that use it
+    def __init__(self, class_path):
+        self.keys = tuple(class_path.split(','))
+        self.parents = self.keys[:-1]
+        self.leaf = self.keys[-1]
+
+    def get(self, node, depth):
+        # Walk the existing Dictionaries of the first depth keys
+        for key in self.keys[:depth]: node = node[key]
+        return node
+
+    def setdefault(self, node, leaf_type):
+        # Walk the whole path in one pass, creating the missing Dictionaries
+        # and a leaf_type() for the last key
+        for key in self.parents:
+            if not node.get(key): node[key] = {}
+            node = node[key]
+        if not node.get(self.leaf): node[self.leaf] = leaf_type()
+        return node[self.leaf]
+
+class_paths = {}
+
+# Files written and skipped by write_output for each Site
+output_stats = {}
+
+# The Jinja2 Environment of each Template Directory
+template_envs = {}
+
+# Keeps the Lines from Sites run in parallel whole
+stdout_lock = threading.Lock()
+
+# What terraform fmt turned a generated file into, by the hash of its content
+formatted_hashes = {}
+
+# The easy-aci-complete Repository and the hashes of its cached files
+modules_url = 'https://github.com/terraform-cisco-modules/easy-aci-complete'
+module_hashes = {}
+
 #========================================================
 # Function to Connect to the APIC API
 #========================================================
@@ -87,80 +670,91 @@ def annotations_split(annotations):
 def apply_terraform(args, path_sep, **easyDict):
     folders           = easyDict['changed_folders']
     base_dir          = args.dir
-    running_directory = os.getcwd()
-    sites             = easyDict['site_names']
     print(f'\n-----------------------------------------------------------------------------\n')
     print(f'  Found the Followng Folders with uncommitted changes:\n')
     for folder in folders: print(f'  - {folder}')
     print(f'\n  Beginning Terraform Proceedures.')
     print(f'\n-----------------------------------------------------------------------------\n')
-    tfe_dir = f'.terraform{path_sep}providers{path_sep}'
-    tfe_cmd = subprocess.Popen(['terraform', 'init', '-upgrade'],
-        cwd=running_directory, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
-    )
-    output, err = tfe_cmd.communicate()
-    tfe_cmd.wait()
-
-    print(output.decode('utf-8'))
-    response_p = ''
-    response_a = ''
-    sites = easyDict['sites'].keys()
-    for site in sites:
+    # Every Site installs its Providers from one shared Plugin Cache
+    if os.environ.get('TF_PLUGIN_CACHE_DIR') == None:
+        os.environ['TF_PLUGIN_CACHE_DIR'] = os.path.join(os.path.expanduser('~'), '.easy_aci', 'plugins')
+    os.makedirs(os.environ['TF_PLUGIN_CACHE_DIR'], exist_ok=True)
+
+    # The local Sites with changes are planned together
+    changed_paths = [os.path.normpath(os.path.abspath(x)) for x in folders]
+    changed_sites = []
+    plan_sites = []
+    site_paths = {}
+    for site in easyDict['sites'].keys():
         run_loc = easyDict['sites'][site]['site_settings']['run_location']
         site_name = easyDict['sites'][site]['site_settings']['site_name']
         path = f'{base_dir}{path_sep}{site_name}'
-        run_count = 0
-        for folder in folders:
-            if site_name in folder:
-                run_count +=1
-        if run_loc == 'local' and run_count > 0:
-            if os.path.isfile(os.path.join(path, '.terraform.lock.hcl')):
-                os.remove(os.path.join(path, '.terraform.lock.hcl'))
-            if os.path.isdir(os.path.join(path, '.terraform')):
-                shutil.rmtree(os.path.join(path, '.terraform'))
-            lock_count = 0
-            tfe_cmd = subprocess.Popen(
-                ['terraform', 'init', f'-plugin-dir={running_directory}/{tfe_dir}'],
-                cwd=path, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
-            )
-            output, err = tfe_cmd.communicate()
-            tfe_cmd.wait()
-            print(output.decode('utf-8'))
-            if 'does not match configured version' in output.decode('utf-8'): lock_count =+ 1
-            if lock_count > 0:
-                tfe_cmd = subprocess.Popen(
-                    ['terraform', 'init', '-upgrade', f'-plugin-dir={running_directory}/{tfe_dir}'], cwd=path
-                )
-                tfe_cmd.wait()
-                print(output.decode('utf-8'))
-            tfe_cmd = subprocess.Popen(['terraform', 'plan', '-out=main.plan'], cwd=path)
-            output, err = tfe_cmd.communicate()
-            tfe_cmd.wait()
-            if not output == None: print(output.decode('utf-8'))
-            while True:
+        site_paths[site_name] = path
+        if os.path.normpath(os.path.abspath(path)) in changed_paths:
+            changed_sites.append(site_name)
+            if run_loc == 'local': plan_sites.append(site_name)
+    if len(plan_sites) > 0:
+        init_hashes = {}
+        for site_name in plan_sites:
+            init_hashes[site_name] = terraform_init_hash(site_paths[site_name], easyDict.get('latest_versions', {}))
+        init_sites = [x for x in plan_sites if not terraform_init_current(site_paths[x], init_hashes[x])]
+        workers = max(1, min(args.terraform_jobs, len(plan_sites)))
+        print(f'\n-----------------------------------------------------------------------------\n')
+        print(f'  Running "terraform plan" for {len(plan_sites)} Sites, {workers} at a time.')
+        print(f'  {len(init_sites)} of them need "terraform init".')
+        print(f'\n-----------------------------------------------------------------------------\n')
+        # The Plugin Cache is not safe for parallel writes, so the first
+        # init fills it before the others read from it
+        if len(init_sites) > 1: terraform_init_site(init_sites[0], site_paths[init_sites[0]], init_hashes[init_sites[0]])
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            plans = dict(zip(plan_sites, executor.map(
+                terraform_plan_site, plan_sites, [site_paths[x] for x in plan_sites], [init_hashes[x] for x in plan_sites]
+            )))
+        ready = [x for x in plan_sites if plans[x]['status'] == 'Changes']
+        # A Site is only recorded in the Manifest once it matches its Plan
+        manifest_commit(base_dir, [x for x in plan_sites if plans[x]['status'] == 'No Changes'])
+        while True:
+            print(f'\n-----------------------------------------------------------------------------\n')
+            print(f'  Terraform Plans Complete.  Please Review the Plans and confirm which Sites')
+            print(f'  to move forward with.\n')
+            for site_name in plan_sites:
+                if site_name in ready: line = f'  {ready.index(site_name) + 1}. {site_name}'
+                else: line = f'  -  {site_name}'
+                print(f'{line:<30} {plans[site_name]["status"]:<12} {plans[site_name]["elapsed"]:.1f}s')
+            print(f'\n  "A" to Apply every Plan with Changes. "S" to Skip them all.  "Q" to Quit.')
+            print(f'  Or the Numbers of the Sites to Apply, separated by commas, i.e. "1,3".')
+            print(f'\n-----------------------------------------------------------------------------\n')
+            response_p = input('  Please Enter ["A", "S", "Q" or the Site Numbers]: ')
+            if response_p == 'A':
+                approved = ready
+                break
+            elif response_p == 'S':
+                approved = []
+                break
+            elif response_p == 'Q': exit()
+            elif re.search('^[0-9]+( *, *[0-9]+)*$', response_p) and all(
+                [0 < int(x) <= len(ready) for x in response_p.split(',')]):
+                approved = [ready[int(x) - 1] for x in response_p.split(',')]
+                break
+            else:
                 print(f'\n-----------------------------------------------------------------------------\n')
-                print(f'  Terraform Plan Complete.  Please Review the Plan and confirm if you want')
-                print(f'  to move forward.  "A" to Apply the Plan. "S" to Skip.  "Q" to Quit.')
-                print(f'  Current Working Directory: {path}')
+                print(f'  A Valid Response is either "A", "S", "Q" or the Numbers of Sites with Changes...')
                 print(f'\n-----------------------------------------------------------------------------\n')
-                response_p = input('  Please Enter ["A", "S" or "Q"]: ')
-                if re.search('^(A|S)$', response_p): break
-                elif response_p == 'Q': exit()
-                else:
-                    print(f'\n-----------------------------------------------------------------------------\n')
-                    print(f'  A Valid Response is either "A", "S" or "Q"...')
-                    print(f'\n-----------------------------------------------------------------------------\n')
-
-            if response_p == 'A':
-                tfe_cmd = subprocess.Popen(['terraform', 'apply', '-parallelism=1', 'main.plan'], cwd=path)
-                tfe_cmd.wait()
-                output, err = tfe_cmd.communicate()
-                tfe_cmd.wait()
-                if not output == None: print(output.decode('utf-8'))
-                print(f'\n--------------------------------------------------------------------------------\n')
-                print(f'  Terraform Apply Complete.  Please Review for any errors and confirm next steps')
-                print(f'\n--------------------------------------------------------------------------------\n')
 
+        if len(approved) > 0:
+            workers = max(1, min(args.terraform_jobs, len(approved)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                applies = dict(zip(approved, executor.map(
+                    terraform_apply_site, approved, [site_paths[x] for x in approved]
+                )))
+            manifest_commit(base_dir, [x for x in approved if applies[x]['status'] == 'Applied'])
+            print(f'\n--------------------------------------------------------------------------------\n')
+            print(f'  Terraform Apply Complete.  Please Review for any errors and confirm next steps\n')
+            for site_name in approved:
+                print(f'  - {site_name:<27} {applies[site_name]["status"]:<12} {applies[site_name]["elapsed"]:.1f}s')
+            print(f'\n--------------------------------------------------------------------------------\n')
+
+    for site_name, path in site_paths.items():
         if args.git_check == True:
             while True:
                 print(f'\n-----------------------------------------------------------------------------\n')
@@ -182,14 +776,100 @@ def apply_terraform(args, path_sep, **easyDict):
             while True:
                 if response_a == 'C':
                     print(f'\n-----------------------------------------------------------------------------\n')
-                    commit_message = input(f'  Please Enter your Commit Message for the folder {folder}: ')
+                    commit_message = input(f'  Please Enter your Commit Message for the folder {path}: ')
                     baseRepo = git.Repo(args.dir)
                     baseRepo.git.add(all=True)
-                    baseRepo.git.commit('-m', f'{commit_message}', '--', folder)
+                    baseRepo.git.commit('-m', f'{commit_message}', '--', path)
                     baseRepo.git.push()
                     break
                 else: break
 
+    # The Sites run by Terraform Cloud are handed over once the files are written
+    manifest_commit(base_dir, [x for x in changed_sites if not x in plan_sites])
+
+#========================================================
+# Function to Hash what 'terraform init' depends on
+#========================================================
+def terraform_init_hash(path, latest_versions):
+    # The Provider Versions and the Module Sources of the root Module decide
+    # what terraform init installs
+    sources = []
+    for fname in sorted(os.listdir(path)):
+        if fname.endswith('.tf') and os.path.isfile(os.path.join(path, fname)):
+            with open(os.path.join(path, fname), 'r') as fh:
+                for line in fh:
+                    if re.search(r'^\s*(source|version)\s*=', line): sources.append(f'{fname}: {line.strip()}')
+    init_state = {'latest_versions':latest_versions, 'sources':sources}
+    return hashlib.sha256(json.dumps(init_state, sort_keys=True).encode('utf-8')).hexdigest()
+
+#========================================================
+# Function to Check if the last 'terraform init' of a
+# Site is still current
+#========================================================
+def terraform_init_current(path, init_hash):
+    init_file = os.path.join(path, '.terraform', 'easy_aci_init.sha256')
+    if not os.path.isfile(os.path.join(path, '.terraform.lock.hcl')): return False
+    elif not os.path.isfile(init_file): return False
+    with open(init_file, 'r') as fh:
+        return fh.read().strip() == init_hash
+
+#========================================================
+# Function to run 'terraform init' for one Site
+#========================================================
+def terraform_init_site(site_name, path, init_hash):
+    # The Lock File is kept, and only upgraded when the Provider Versions moved
+    returncode, output = terraform_stream(site_name, path, ['init', '-input=false'])
+    if 'does not match configured version' in output or 'locked provider' in output:
+        returncode, output = terraform_stream(site_name, path, ['init', '-input=false', '-upgrade'])
+    if returncode == 0:
+        with open(os.path.join(path, '.terraform', 'easy_aci_init.sha256'), 'w') as fh:
+            fh.write(init_hash)
+    return returncode
+
+#========================================================
+# Function to run 'terraform init' and 'terraform plan'
+# for one Site
+#========================================================
+def terraform_plan_site(site_name, path, init_hash):
+    start = time.perf_counter()
+    if terraform_init_current(path, init_hash): returncode = 0
+    else: returncode = terraform_init_site(site_name, path, init_hash)
+    if returncode == 0:
+        # -detailed-exitcode returns 0 for No Changes and 2 for a Plan with Changes
+        returncode, output = terraform_stream(
+            site_name, path, ['plan', '-input=false', '-detailed-exitcode', '-out=main.plan']
+        )
+        if returncode == 0: status = 'No Changes'
+        elif returncode == 2: status = 'Changes'
+        else: status = 'Plan Failed'
+    else: status = 'Init Failed'
+    return {'elapsed':time.perf_counter() - start, 'status':status}
+
+#========================================================
+# Function to run 'terraform apply' for one Site
+#========================================================
+def terraform_apply_site(site_name, path):
+    start = time.perf_counter()
+    returncode, output = terraform_stream(site_name, path, ['apply', '-input=false', '-parallelism=1', 'main.plan'])
+    if returncode == 0: status = 'Applied'
+    else: status = 'Failed'
+    return {'elapsed':time.perf_counter() - start, 'status':status}
+
+#========================================================
+# Function to Stream a terraform Command with the Site
+# Name in front of every Line
+#========================================================
+def terraform_stream(site_name, path, command):
+    tfe_cmd = subprocess.Popen(['terraform'] + command,
+        cwd=path, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    )
+    lines = []
+    for line in io.TextIOWrapper(tfe_cmd.stdout, encoding='utf-8', errors='replace'):
+        lines.append(line)
+        with stdout_lock: print(f'[{site_name}] {line.rstrip()}', flush=True)
+    tfe_cmd.wait()
+    return tfe_cmd.returncode, ''.join(lines)
+
 #========================================================
 # Function to Add Required Arguments
 #========================================================
@@ -212,42 +892,22 @@ def args_remove(args_list, jsonData):
 # Function to Check the Existance of a Template
 #========================================================
 def confirm_templates_exist(template_type, template_name, **kwargs):
-    def template_check(site, template_type, template_name, **kwargs):
-        template_count = 0
-        if kwargs['easyDict']['sites'][site]['templates'].get(template_type):
-            for i in kwargs['easyDict']['sites'][site]['templates'][template_type]:
-                if i['template_name'] == template_name:
-                    template_count += 1
-                    if template_type == 'bridge_domains':
-                        if len(kwargs['l3outs']) > 0:
-                            if not i.get('l3_configurations'):
-                                i['l3_configurations'] = deepcopy({})
-                                if not i['l3_configurations'].get('l3outs'):
-                                    i['l3_configurations']['l3outs'] = deepcopy([])
-                                i['l3_configurations']['l3outs'].append(deepcopy(kwargs['l3outs']))
-        if template_count == 0:
+    row = ez_row(kwargs, 'bd_template', 'epg_template', 'l3outs', 'subnet_templates')
+    def template_check(site):
+        i = ez_policy(site['templates'], template_type, 'template_name', template_name)
+        if i == None:
             if template_type == 'application_epgs':
-                validating.error_template_not_found('epg_template', **kwargs)
+                validating.error_template_not_found('epg_template', **row)
             elif template_type == 'bridge_domains':
-                validating.error_template_not_found('bd_template', **kwargs)
-            else: validating.error_template_not_found('subnet_templates', **kwargs)
-    
-    if 'Grp_' in kwargs['site_group']:
-        sites = kwargs['easyDict']['site_groups'][kwargs['site_group']]['sites']
-        for site in sites:
-            template_check(site, template_type, template_name, **kwargs)
-    else: template_check(kwargs['site_group'], template_type, template_name, **kwargs)
+                validating.error_template_not_found('bd_template', **row)
+            else: validating.error_template_not_found('subnet_templates', **row)
+        elif template_type == 'bridge_domains':
+            if len(row['l3outs']) > 0:
+                if not i.get('l3_configurations'):
+                    i['l3_configurations'] = {'l3outs':[row['l3outs']]}
+
+    ez_sites('templates', template_check, **kwargs)
 
-#========================================================
-# Function to Count the Number of Keys/Columns
-#========================================================
-def countKeys(ws, func):
-    count = 0
-    for i in ws.rows:
-        if any(i):
-            if str(i[0].value) == func:
-                count += 1
-    return count
 
 #========================================================
 # Function to Create Interface Selectors
@@ -411,43 +1071,16 @@ def create_yaml(args, easy_jsonData, **easyDict):
     if opSystem == 'Windows': path_sep = '\\'
     else: path_sep = '/'
 
+    # The YAML files are collected per Site here and written by yaml_site
+    site_files = []
     def write_file(dest_dir, dest_file, dict, title1):
-        class MyDumper(yaml.Dumper):
-            def increase_indent(self, flow=False, indentless=False):
-                return super(MyDumper, self).increase_indent(flow, False)
-        
-        if not os.path.exists(os.path.join(dest_dir, dest_file)):
-            create_file = f'type nul >> {os.path.join(dest_dir, dest_file)}'
-            os.system(create_file)
-        wr_file = open(os.path.join(dest_dir, dest_file), 'w')
-        wr_file.write('---\n')
-        wr_file = open(os.path.join(dest_dir, dest_file), 'a')
-        dash_length = '='*(len(title1) + 20)
-        wr_file.write(f'#{dash_length}\n')
-        wr_file.write(f'#   {title1} - Variables\n')
-        wr_file.write(f'#{dash_length}\n')
-        stream = yaml.dump(dict, default_flow_style=False)
-        wr_file.write(stream.replace('\n- ', '\n\n- '))
-        # wr_file.write(yaml.dump(dict, Dumper=MyDumper, default_flow_style=False))
-        wr_file.close()
+        site_files[-1][1].append((dest_dir, dest_file, dict, title1))
 
     for k,v in easyDict['sites'].items():
         baseRepo = args.dir
         site_name = easyDict['sites'][k]['site_settings']['site_name']
-        
-        # Remove Random Lines from Dictionary.  Need to figure out why this happens
-        pop_list = ['snmp_client_groups', 'snmp_communities', 'snmp_destinations', 'users']
-        if easyDict['sites'][k].get('fabric'):
-            if easyDict['sites'][k]['fabric'].get('policies'):
-                if easyDict['sites'][k]['fabric']['policies'].get('pod'):
-                    if easyDict['sites'][k]['fabric']['policies'].get('pod'):
-                        for item in easyDict['sites'][k]['fabric']['policies']['pod']['date_and_time']:
-                            for i in pop_list:
-                                if item.get(i): item.pop(i)
-        if easyDict['sites'][k].get('switch'):
-            if easyDict['sites'][k]['switch'].get('vpc_domains'):
-                for item in easyDict['sites'][k]['switch']['vpc_domains']:
-                    item.pop('interfaces')
+        site_files.append((site_name, []))
+
         for item in classes:
             if easyDict['sites'][k].get(item):
                 if item == 'tenants':
@@ -489,7 +1122,111 @@ def create_yaml(args, easy_jsonData, **easyDict):
                             else:
                                 title1 = f"{str.title(item.replace('_', ' '))} -> {str.title(i.replace('_', ' '))}"
                             write_file(dest_dir, dest_file, dict, title1)
-                        
+
+    # The Sites are independent, so their YAML is dumped in a Process Pool.
+    # The results are read back in Site order
+    if easyDict.get('incremental'): state_yaml = easyDict['incremental']['state']['yaml']
+    else: state_yaml = None
+    if args.jobs > 1 and len(site_files) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(site_files))) as executor:
+            futures = [executor.submit(yaml_site, args.dir, x[1], state_yaml) for x in site_files]
+            results = [future.result() for future in futures]
+    else: results = [yaml_site(args.dir, x[1], state_yaml) for x in site_files]
+    for x in range(0, len(site_files)):
+        site_name = site_files[x][0]
+        result = results[x]
+        if easyDict.get('incremental'):
+            easyDict['incremental']['yaml'].update(result['hashes'])
+        stats = write_stats(site_name)
+        for i in ['skipped', 'written']: stats[i] += result['stats'][i]
+        stats['changed'].extend(result['stats']['changed'])
+        stats['files'].update(result['stats']['files'])
+        stdout_log(None, None, 'site', f'Site "{site_name}": wrote {result["stats"]["written"]} of '
+            f'{result["files"]} YAML files in {result["elapsed"]:.3f}s')
+
+#========================================================
+# Function to Emit easyDict Data as YAML
+#========================================================
+def ez_yaml(data, libyaml=yaml.__with_libyaml__):
+    if libyaml == True:
+        stream = ez_spaced_stream()
+        try:
+            yaml.dump(data, stream, Dumper=ez_libyaml_dumper, default_flow_style=False)
+            return stream.getvalue()
+        except ez_libyaml_fallback: pass
+    return yaml.dump(data, Dumper=ez_python_dumper, default_flow_style=False)
+
+#========================================================
+# Function to Write the YAML Files of a Site
+#========================================================
+def yaml_site(base_dir, site_files, state_yaml):
+    # Runs in the create_yaml Process Pool, so the Incremental hashes are
+    # returned rather than saved.  Unchanged files are skipped when the
+    # previous hashes are given
+    start = time.perf_counter()
+    hashes = {}
+    stats = {'changed':[], 'files':{}, 'skipped':0, 'written':0}
+    for dest_dir, dest_file, dict, title1 in site_files:
+        file_path = os.path.join(dest_dir, dest_file)
+        if not state_yaml == None:
+            yaml_file = os.path.relpath(file_path, base_dir)
+            hashes[yaml_file] = fingerprint([title1, dict])
+            if state_yaml.get(yaml_file) == hashes[yaml_file] and os.path.isfile(file_path):
+                stats['files'][file_path] = file_sha256(file_path)
+                stats['skipped'] += 1
+                continue
+
+        dash_length = '='*(len(title1) + 20)
+        header = f'---\n#{dash_length}\n#   {title1} - Variables\n#{dash_length}\n'
+        write_output(file_path, header + ez_yaml(dict), stats)
+    return {'elapsed':time.perf_counter() - start, 'files':len(site_files), 'hashes':hashes, 'stats':stats}
+
+#========================================================
+# Function to Write an Output File only when it Changed
+#========================================================
+def write_output(file_path, content, stats):
+    # Files that already hold the same bytes are left alone, so their mtime,
+    # git status and terraform fmt do not see a change.  The size is
+    # compared first, then the hash, then the bytes.  The hash of every file
+    # goes to the Site Manifest
+    if isinstance(content, str):
+        content = content.replace('\n', os.linesep).encode('utf-8')
+    content_hash = hashlib.sha256(content).hexdigest()
+    stats['files'][file_path] = content_hash
+    if os.path.isfile(file_path):
+        if os.path.getsize(file_path) == len(content) and file_sha256(file_path) == content_hash:
+            with open(file_path, 'rb') as fh:
+                if fh.read() == content:
+                    stats['skipped'] += 1
+                    return False
+        elif content_hash in formatted_hashes and file_sha256(file_path) == formatted_hashes[content_hash]:
+            # The file holds this content the way terraform fmt left it
+            stats['skipped'] += 1
+            return False
+    # A new file replaces the old one, so a hard linked file is never written into
+    with open(file_path + '.tmp', 'wb') as fh:
+        fh.write(content)
+    os.replace(file_path + '.tmp', file_path)
+    stats['changed'].append(file_path)
+    stats['written'] += 1
+    return True
+
+#========================================================
+# Function to get the Output Write Counts of a Site
+#========================================================
+def write_stats(site_name):
+    if not site_name in output_stats:
+        output_stats[site_name] = {'changed':[], 'files':{}, 'skipped':0, 'written':0}
+    return output_stats[site_name]
+
+#========================================================
+# Function to Report the Output Write Counts of every Site
+#========================================================
+def write_report():
+    for site_name, stats in output_stats.items():
+        stdout_log(None, None, 'site', f'Site "{site_name}": {stats["written"]} files written, '
+            f'{stats["skipped"]} unchanged files skipped')
+
 #========================================================
 # Function for Processing Loops to auto.tfvars files
 #========================================================
@@ -511,499 +1248,304 @@ def env_sensitive(sensitive_list, jsonData, polVars, **kwargs):
 # Function to Append the easyDict Dictionary
 #========================================================
 def ez_append(polVars, **kwargs):
-    class_path = kwargs['class_path']
-    cS = class_path.split(',')
+    path = ez_path(kwargs['class_path'])
     polVars.pop('site_group')
     polVars = ez_remove_empty(polVars)
 
-    def site_append(cS, site, polVars):
-        if not kwargs['easyDict']['sites'].get(site):
-            validating.error_site_group('site_group', **kwargs)
+    def site_append(site):
+        path.setdefault(site, named_list).append(polVars)
 
-        # Confirm the Key Exists
-        if len(cS) == 1:
-            if not kwargs['easyDict']['sites'][site].get(cS[0]):
-                kwargs['easyDict']['sites'][site].update(deepcopy({cS[0]:[]}))
-        if len(cS) >= 2:
-            if not kwargs['easyDict']['sites'][site].get(cS[0]):
-                kwargs['easyDict']['sites'][site].update(deepcopy({cS[0]:{}}))
-        if len(cS) >= 3:
-            if not kwargs['easyDict']['sites'][site][cS[0]].get(cS[1]):
-                kwargs['easyDict']['sites'][site][cS[0]].update(deepcopy({cS[1]:{}}))
-        if len(cS) >= 4:
-            if not kwargs['easyDict']['sites'][site][cS[0]][cS[1]].get(cS[2]):
-                kwargs['easyDict']['sites'][site][cS[0]][cS[1]].update(deepcopy({cS[2]:{}}))
-        if len(cS) == 1: cs_count = 0
-        elif len(cS) == 2:
-            if not kwargs['easyDict']['sites'][site][cS[0]].get(cS[1]):
-                kwargs['easyDict']['sites'][site][cS[0]].update(deepcopy({cS[1]:[]}))
-        elif len(cS) == 3:
-            if not kwargs['easyDict']['sites'][site][cS[0]][cS[1]].get(cS[2]):
-                kwargs['easyDict']['sites'][site][cS[0]][cS[1]].update(deepcopy({cS[2]:[]}))
-        elif len(cS) == 4:
-            if not kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]].get(cS[3]):
-                kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]].update(deepcopy({cS[3]:[]}))
-        elif len(cS) == 5:
-            if not kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]].get(cS[3]):
-                kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]].update(deepcopy({cS[3]:{}}))
-            if not kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[3]].get(cS[4]):
-                kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[3]].update(deepcopy({cS[4]:[]}))
-        
-        # append the Dictionary
-        if len(cS) == 1:   kwargs['easyDict']['sites'][site][cS[0]].append(deepcopy(polVars))
-        elif len(cS) == 2: kwargs['easyDict']['sites'][site][cS[0]][cS[1]].append(deepcopy(polVars))
-        elif len(cS) == 3: kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]].append(deepcopy(polVars))
-        elif len(cS) == 4: kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[3]].append(deepcopy(polVars))
-        elif len(cS) == 5: kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[3]][cS[4]].append(deepcopy(polVars))
-
-    if 'Grp_' in kwargs['site_group']:
-        if kwargs['easyDict']['site_groups'].get(kwargs['site_group']):
-            sites = kwargs['easyDict']['site_groups'][kwargs['site_group']]['sites']
-            for site in sites:
-                site_append(cS, site, polVars)
-        else: validating.error_site_group('site_group', **kwargs)
-    else: site_append(cS, kwargs['site_group'], polVars)
-        
-    return kwargs['easyDict']
+    return ez_sites(path.keys[0], site_append, **kwargs)
 
 #========================================================
 # Function to Append Subtype easyDict Dictionary
 #========================================================
 def ez_append_subtype(polVars, **kwargs):
-    class_path   = kwargs['class_path']
-    cS = class_path.split(',')
+    path = ez_path(kwargs['class_path'])
     policy  = kwargs['policy']
     policy_name  = kwargs['policy_name']
     polVars.pop('site_group')
     polVars = ez_remove_empty(polVars)
 
-    def site_append(cS, site, polVars):
+    def site_append(site):
         # Assign the Dictionary
-        if len(cS) == 3:   dict1 = kwargs['easyDict']['sites'][site][cS[0]]
-        elif len(cS) == 4: dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]]
-        elif len(cS) == 5: dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]]
-        elif len(cS) == 6: dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[3]]
-
-        for k, v in dict1.items():
-            for i in v:
-                if not i.get(cS[-1]):
-                    i[cS[-1]] = []
-                if i[policy] == policy_name:
-                    i[cS[-1]].append(deepcopy(polVars))
-                    break
-        
-    if 'Grp_' in kwargs['site_group']:
-        if kwargs['easyDict']['site_groups'].get(kwargs['site_group']):
-            sites = kwargs['easyDict']['site_groups'][kwargs['site_group']]['sites']
-            for site in sites:
-                site_append(cS, site, polVars)
-        else: validating.error_site_group('site_group', **kwargs)
-    else: site_append(cS, kwargs['site_group'], polVars)
+        dict1 = path.get(site, -2)
+
+        i = ez_policy(dict1, path.keys[-2], policy, policy_name)
+        if i:
+            if not i.get(path.keys[-1]):
+                i[path.keys[-1]] = named_list()
+            i[path.keys[-1]].append(polVars)
 
     # Return Dictionary
-    return kwargs['easyDict']
+    return ez_sites(path.keys[0], site_append, **kwargs)
 
 #========================================================
 # Function to Append Subtype easyDict Dictionary
 #========================================================
 def ez_append_arg(polVars, **kwargs):
-    class_path   = kwargs['class_path']
-    cS = class_path.split(',')
+    path = ez_path(kwargs['class_path'])
     policy  = kwargs['policy']
     policy_name  = kwargs['policy_name']
     polVars.pop('site_group')
     polVars = ez_remove_empty(polVars)
 
-    def site_append(cS, site, polVars):
+    def site_append(site):
         # Assign the Dictionary
-        if len(cS) == 3:   dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]]
-        elif len(cS) == 4: dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]]
-        elif len(cS) == 5: dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[3]]
-        elif len(cS) == 6: dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[3]][cS[4]]
-
-        for i in dict1:
-            if not i.get(cS[-1]):
-                i[cS[-1]] = []
-            if i[policy] == policy_name:
-                i[cS[-1]].extend(polVars[cS[-1]])
-                break
-        
-    if 'Grp_' in kwargs['site_group']:
-        if kwargs['easyDict']['site_groups'].get(kwargs['site_group']):
-            sites = kwargs['easyDict']['site_groups'][kwargs['site_group']]['sites']
-            for site in sites:
-                site_append(cS, site, polVars)
-        else: validating.error_site_group('site_group', **kwargs)
-    else: site_append(cS, kwargs['site_group'], polVars)
+        dict1 = path.get(site, -2)
+
+        i = ez_policy(dict1, path.keys[-2], policy, policy_name)
+        if i:
+            if not i.get(path.keys[-1]):
+                i[path.keys[-1]] = []
+            i[path.keys[-1]].extend(polVars[path.keys[-1]])
+
     # Return Dictionary
-    return kwargs['easyDict']
+    return ez_sites(path.keys[0], site_append, **kwargs)
 
 #========================================================
 # Function to Append the easyDict Dictionary
 #========================================================
 def ez_merge(polVars, **kwargs):
-    class_path = kwargs['class_path']
-    cS = class_path.split(',')
+    path = ez_path(kwargs['class_path'])
     policy  = kwargs['policy']
     policy_name  = kwargs['policy_name']
     polVars.pop('site_group')
     polVars = ez_remove_empty(polVars)
 
-    def site_merge(cS, site, polVars):
-        if not kwargs['easyDict']['sites'].get(site):
-            validating.error_site_group('site_group', **kwargs)
-
+    def site_merge(site):
         # Assign the Dictionary
-        if len(cS) == 3:   dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]]
-        elif len(cS) == 4: dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[3]]
-        elif len(cS) == 5: dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[4]][cS[5]]
+        dict1 = path.get(site, -1)
 
-        for i in dict1:
-            if i[policy] == policy_name:
-                i.update(deepcopy(polVars))
-                break
+        i = ez_policy(dict1, path.keys[-1], policy, policy_name)
+        if i:
+            i.update(polVars)
 
-    if 'Grp_' in kwargs['site_group']:
-        if kwargs['easyDict']['site_groups'].get(kwargs['site_group']):
-            sites = kwargs['easyDict']['site_groups'][kwargs['site_group']]['sites']
-            for site in sites:
-                site_merge(cS, site, polVars)
-        else: validating.error_site_group('site_group', **kwargs)
-    else: site_merge(cS, kwargs['site_group'], polVars)
-    return kwargs['easyDict']
+    return ez_sites(path.keys[0], site_merge, **kwargs)
+
+#========================================================
+# Function to Compile a class_path for easyDict Insertion
+#========================================================
+def ez_path(class_path):
+    if not class_path in class_paths:
+        class_paths[class_path] = easy_path(class_path)
+    return class_paths[class_path]
+
+#========================================================
+# Function to Find a Policy by Name in an easyDict List
+#========================================================
+def ez_policy(parent, key, policy, policy_name):
+    # Lists built outside of the ez_* helpers are indexed on first use.
+    # The Policy returned belongs to this Site and can be changed
+    if not isinstance(parent.get(key), list): return None
+    if not isinstance(parent[key], named_list):
+        parent[key] = named_list(parent[key])
+    position = parent[key].find(policy, policy_name)
+    if position == None: return None
+    return parent[key].own(position)
+
+#========================================================
+# Function to Copy a frozen easyDict Policy for a Site
+#========================================================
+def ez_thaw(value):
+    # Copy the containers of the Policy, the rows in its Policy Lists stay
+    # shared until they are owned in turn
+    if isinstance(value, named_list): return named_list(value)
+    elif isinstance(value, ez_record): return value.__class__([(k, ez_thaw(v)) for k, v in value.items()])
+    elif isinstance(value, dict): return {k:ez_thaw(v) for k, v in value.items()}
+    elif isinstance(value, list): return [ez_thaw(v) for v in value]
+    return value
 
 #========================================================
 # Function to Remove Empty Arguments
 #========================================================
 def ez_remove_empty(polVars):
-    pop_list = []
-    for k,v in polVars.items():
-        if v == None:
-            pop_list.append(k)
-    for i in pop_list:
-        polVars.pop(i)
-    return polVars
+    # A new Dictionary, or Record, so the frozen row does not keep the space
+    # of the Arguments popped from it
+    return polVars.__class__([(k, v) for k, v in polVars.items() if not v == None])
+
+#========================================================
+# Function to Keep the Row Values a Deferred Row reports
+#========================================================
+def ez_row(kwargs, *keys):
+    # A Site Group row may be applied after the Handler returned, so only
+    # keep what its error messages need, not the whole Row
+    row = {'row_num':kwargs['row_num'], 'ws':kwargs['ws']}
+    for key in keys:
+        if key in kwargs: row[key] = kwargs[key]
+    return row
+
+#========================================================
+# Function to Apply a Row to its Site or Site Group
+#========================================================
+def ez_sites(key, site_apply, **kwargs):
+    # A Site Group row is checked here and queued once on every Site of the
+    # Group, under the top level key it changes.  A Site row is applied now
+    sites = kwargs['easyDict']['sites']
+    if 'Grp_' in kwargs['site_group']:
+        if not kwargs['easyDict']['site_groups'].get(kwargs['site_group']):
+            validating.error_site_group('site_group', **kwargs)
+        for site in kwargs['easyDict']['site_groups'][kwargs['site_group']]['sites']:
+            if not site in sites:
+                validating.error_site_group('site_group', **kwargs)
+            sites[site].defer(key, site_apply)
+    else:
+        if not kwargs['site_group'] in sites:
+            validating.error_site_group('site_group', **kwargs)
+        site_apply(sites[kwargs['site_group']])
+    return kwargs['easyDict']
 
 #========================================================
 # Function to Append the Tenant easyDict Dictionary
 #========================================================
 def ez_tenants_append(polVars, **kwargs):
-    class_path = kwargs['class_path']
-    cS = class_path.split(',')
+    path = ez_path(kwargs['class_path'])
+    row  = ez_row(kwargs, 'tenant')
     polVars.pop('site_group')
     polVars = ez_remove_empty(polVars)
 
-    def site_append(cS, site, polVars):
-        if not kwargs['easyDict']['sites'].get(site):
-            validating.error_site_group('site_group', **kwargs)
-        tenant_match = False
-        tkey = 0
-        for i in kwargs['easyDict']['sites'][site]['tenants']:
-            if i['name'] == kwargs['tenant']:
-                tenant_match = True
-                break
-            tkey += 1
-        if tenant_match == False:
-            validating.error_tenant('tenant', **kwargs)
-
-        # Confirm the Key Exists
-        if len(cS) == 1:
-            if not kwargs['easyDict']['sites'][site]['tenants'][tkey].get(cS[0]):
-                kwargs['easyDict']['sites'][site]['tenants'][tkey].update(deepcopy({cS[0]:[]}))
-        if len(cS) >= 2:
-            if not kwargs['easyDict']['sites'][site]['tenants'][tkey].get(cS[0]):
-                kwargs['easyDict']['sites'][site]['tenants'][tkey].update(deepcopy({cS[0]:{}}))
-        if len(cS) >= 3:
-            if not kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]].get(cS[1]):
-                kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]].update(deepcopy({cS[1]:{}}))
-        if len(cS) >= 4:
-            if not kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]].get(cS[2]):
-                kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]].update(deepcopy({cS[2]:{}}))
-        if len(cS) == 1: cs_count = 0
-        elif len(cS) == 2:
-            if not kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]].get(cS[1]):
-                kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]].update(deepcopy({cS[1]:[]}))
-        elif len(cS) == 3:
-            if not kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]].get(cS[2]):
-                kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]].update(deepcopy({cS[2]:[]}))
-        elif len(cS) == 4:
-            if not kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]][cS[2]].get(cS[3]):
-                kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]][cS[2]].update(deepcopy({cS[3]:[]}))
-        
-        # append the Dictionary
-        if len(cS) ==   1: kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]].append(deepcopy(polVars))
-        elif len(cS) == 2: kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]].append(deepcopy(polVars))
-        elif len(cS) == 3: kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]][cS[2]].append(deepcopy(polVars))
-        elif len(cS) == 4: kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]][cS[2]][cS[3]].append(deepcopy(polVars))
+    def site_append(site):
+        tenant = ez_policy(site, 'tenants', 'name', row['tenant'])
+        if tenant == None:
+            validating.error_tenant('tenant', **row)
+        path.setdefault(tenant, named_list).append(polVars)
 
-    if 'Grp_' in kwargs['site_group']:
-        if kwargs['easyDict']['site_groups'].get(kwargs['site_group']):
-            sites = kwargs['easyDict']['site_groups'][kwargs['site_group']]['sites']
-            for site in sites:
-                site_append(cS, site, polVars)
-        else: validating.error_site_group('site_group', **kwargs)
-    else: site_append(cS, kwargs['site_group'], polVars)
-    return kwargs['easyDict']
+    return ez_sites('tenants', site_append, **kwargs)
 
 #========================================================
 # Function to Append L3Out easyDict Dictionary
 #========================================================
 def ez_append_l3out(polVars, **kwargs):
-    class_path  = kwargs['class_path']
-    cS          = class_path.split(',')
+    path        = ez_path(kwargs['class_path'])
     policy      = kwargs['policy']
     policy_name = kwargs['policy_name']
     polVars = ez_remove_empty(polVars)
 
-    def site_append(cS, site, polVars):
+    def site_append(site):
         # Assign the Dictionary
-        dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]]
+        dict1 = path.get(site, 1)
 
-        for i in dict1:
-            if i[policy] == policy_name:
-                i[cS[-2]][cS[-1]][0].update(deepcopy(polVars))
-                break
-        
-    if 'Grp_' in kwargs['site_group']:
-        if kwargs['easyDict']['site_groups'].get(kwargs['site_group']):
-            sites = kwargs['easyDict']['site_groups'][kwargs['site_group']]['sites']
-            for site in sites:
-                site_append(cS, site, polVars)
-        else: validating.error_site_group('site_group', **kwargs)
-    else: site_append(cS, kwargs['site_group'], polVars)
+        i = ez_policy(dict1, path.keys[1], policy, policy_name)
+        if i:
+            i[path.keys[-2]][path.keys[-1]][0].update(polVars)
 
     # Return Dictionary
-    return kwargs['easyDict']
+    return ez_sites(path.keys[0], site_append, **kwargs)
 
 #========================================================
 # Function to Append Subtype easyDict Dictionary
 #========================================================
 def ez_tenants_append_subtype(polVars, **kwargs):
-    class_path  = kwargs['class_path']
-    cS          = class_path.split(',')
+    path        = ez_path(kwargs['class_path'])
     policy      = kwargs['policy']
     policy_name = kwargs['policy_name']
+    row         = ez_row(kwargs, 'tenant')
     polVars.pop('site_group')
     polVars = ez_remove_empty(polVars)
 
-    def site_append(cS, site, polVars):
-        tenant_match = False
-        tkey = 0
-        for i in kwargs['easyDict']['sites'][site]['tenants']:
-            if i['name'] == kwargs['tenant']:
-                tenant_match = True
-                break
-            tkey += 1
-        if tenant_match == False:
-            validating.error_tenant('tenant', **kwargs)
+    def site_append(site):
+        tenant = ez_policy(site, 'tenants', 'name', row['tenant'])
+        if tenant == None:
+            validating.error_tenant('tenant', **row)
 
         # Assign the Dictionary
-        if len(cS) == 2:   dict1 = kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]]
-        elif len(cS) == 3: dict1 = kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]]
-        elif len(cS) == 4: dict1 = kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]][cS[2]]
-        elif len(cS) == 5: dict1 = kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]][cS[2]][cS[3]]
-
-        for i in dict1:
-            if not i.get(cS[-1]):
-                i[cS[-1]] = []
-            if i[policy] == policy_name:
-                i[cS[-1]].append(deepcopy(polVars))
-                break
-        
-    if 'Grp_' in kwargs['site_group']:
-        if kwargs['easyDict']['site_groups'].get(kwargs['site_group']):
-            sites = kwargs['easyDict']['site_groups'][kwargs['site_group']]['sites']
-            for site in sites:
-                site_append(cS, site, polVars)
-        else: validating.error_site_group('site_group', **kwargs)
-    else: site_append(cS, kwargs['site_group'], polVars)
+        dict1 = path.get(tenant, -2)
+
+        i = ez_policy(dict1, path.keys[-2], policy, policy_name)
+        if i:
+            if not i.get(path.keys[-1]):
+                i[path.keys[-1]] = named_list()
+            i[path.keys[-1]].append(polVars)
 
     # Return Dictionary
-    return kwargs['easyDict']
+    return ez_sites('tenants', site_append, **kwargs)
 
 #========================================================
 # Function to Append Subtype easyDict Dictionary
 #========================================================
 def ez_tenants_append_sub_subtype(polVars, **kwargs):
-    class_path  = kwargs['class_path']
-    cS          = class_path.split(',')
+    path         = ez_path(kwargs['class_path'])
     policy1      = kwargs['policy1']
     policy_name1 = kwargs['policy_name1']
     policy2      = kwargs['policy2']
     policy_name2 = kwargs['policy_name2']
+    row          = ez_row(kwargs, 'tenant')
     polVars.pop('site_group')
     polVars = ez_remove_empty(polVars)
 
-    def site_append(cS, site, polVars):
-        tenant_match = False
-        tkey = 0
-        for i in kwargs['easyDict']['sites'][site]['tenants']:
-            if i['name'] == kwargs['tenant']:
-                tenant_match = True
-                break
-            tkey += 1
-        if tenant_match == False:
-            validating.error_tenant('tenant', **kwargs)
+    def site_append(site):
+        tenant = ez_policy(site, 'tenants', 'name', row['tenant'])
+        if tenant == None:
+            validating.error_tenant('tenant', **row)
 
         # Assign the Dictionary
         if policy2 == 'epg_esg_collection_for_vrfs':
-            dict1 = kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]]
+            item = ez_policy(path.get(tenant, -2), path.keys[-2], policy1, policy_name1)
+            if item:
+                item[policy2][path.keys[-1]].append(polVars)
         else:
-            if len(cS) == 3:   dict1 = kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]]
-            elif len(cS) == 4: dict1 = kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]]
-            elif len(cS) == 5: dict1 = kwargs['easyDict']['sites'][site]['tenants'][tkey][cS[0]][cS[1]][cS[2]]
-
-        itcount = 0
-        for item in dict1:
-            if item[policy1] == policy_name1:
-                if policy2 == 'epg_esg_collection_for_vrfs':
-                    item[policy2][cS[-1]].append(deepcopy(polVars))
-                    break
-                else:
-                    icount = 0
-                    #print(dict1[itcount][cS[-2]])
-                    #exit()
-                    for i in dict1[itcount][cS[-2]]:
-                        if not i.get(cS[-1]):
-                            i[cS[-1]] = []
-                        if i[policy2] == policy_name2:
-                            dict1[itcount][cS[-2]][icount][cS[-1]].append(deepcopy(polVars))
-                            break
-                        icount +=1
-            itcount += 1
-        return kwargs['easyDict'] 
-        
-    if 'Grp_' in kwargs['site_group']:
-        if kwargs['easyDict']['site_groups'].get(kwargs['site_group']):
-            sites = kwargs['easyDict']['site_groups'][kwargs['site_group']]['sites']
-            for site in sites:
-                kwargs['easyDict']  = site_append(cS, site, polVars)
-        else: validating.error_site_group('site_group', **kwargs)
-    else: kwargs['easyDict']  = site_append(cS, kwargs['site_group'], polVars)
+            item = ez_policy(path.get(tenant, -3), path.keys[-3], policy1, policy_name1)
+            if item:
+                i = ez_policy(item, path.keys[-2], policy2, policy_name2)
+                if i:
+                    if not i.get(path.keys[-1]):
+                        i[path.keys[-1]] = named_list()
+                    i[path.keys[-1]].append(polVars)
 
     # Return Dictionary
-    return kwargs['easyDict']
+    return ez_sites('tenants', site_append, **kwargs)
 
 #========================================================
 # Function to Append the easyDict Dictionary
 #========================================================
 def ez_update(polVars, **kwargs):
-    class_path = kwargs['class_path']
-    cS = class_path.split(',')
+    path = ez_path(kwargs['class_path'])
     polVars.pop('site_group')
     polVars = ez_remove_empty(polVars)
 
-    def site_update(cS, site, polVars):
-        if not kwargs['easyDict']['sites'].get(site):
-            validating.error_site_group('site_group', **kwargs)
+    def site_update(site):
+        path.setdefault(site, dict).update(polVars)
 
-        # Confirm the Key(s) Exists
-        if not kwargs['easyDict']['sites'][site].get(cS[0]):
-            kwargs['easyDict']['sites'][site].update(deepcopy({cS[0]:{}}))
-        if len(cS) >= 2:
-            if not kwargs['easyDict']['sites'][site][cS[0]].get(cS[1]):
-                kwargs['easyDict']['sites'][site][cS[0]].update(deepcopy({cS[1]:{}}))
-        if len(cS) >= 3:
-            if not kwargs['easyDict']['sites'][site][cS[0]][cS[1]].get(cS[2]):
-                kwargs['easyDict']['sites'][site][cS[0]][cS[1]].update(deepcopy({cS[2]:{}}))
-        if len(cS) >= 4:
-            if not kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]].get(cS[3]):
-                kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]].update(deepcopy({cS[3]:{}}))
-        if len(cS) == 5:
-            if not kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[3]].get(cS[4]):
-                kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[3]].update(deepcopy({cS[4]:{}}))
-
-        # Update the Dictionary
-        if len(cS) == 1:   kwargs['easyDict']['sites'][site][cS[0]].update(deepcopy(polVars))
-        elif len(cS) == 2:   kwargs['easyDict']['sites'][site][cS[0]][cS[1]].update(deepcopy(polVars))
-        elif len(cS) == 3: kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]].update(deepcopy(polVars))
-        elif len(cS) == 4: kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[3]].update(deepcopy(polVars))
-        elif len(cS) == 5: kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[3]][cS[4]].update(deepcopy(polVars))
-
-    if 'Grp_' in kwargs['site_group']:
-        if kwargs['easyDict']['site_groups'].get(kwargs['site_group']):
-            sites = kwargs['easyDict']['site_groups'][kwargs['site_group']]['sites']
-            for site in sites:
-                site_update(cS, site, polVars)
-        else: validating.error_site_group('site_group', **kwargs)
-    else: site_update(cS, kwargs['site_group'], polVars)
-    return kwargs['easyDict']
+    return ez_sites(path.keys[0], site_update, **kwargs)
 
 #========================================================
 # Function to Append Subtype easyDict Dictionary
 #========================================================
 def ez_update_subtype(polVars, **kwargs):
-    class_path   = kwargs['class_path']
-    cS = class_path.split(',')
+    path = ez_path(kwargs['class_path'])
     policy  = kwargs['policy']
     policy_name  = kwargs['policy_name']
     polVars.pop('site_group')
     polVars = ez_remove_empty(polVars)
 
-    def site_append(cS, site, polVars):
+    def site_append(site):
         # Assign the Dictionary
-        if len(cS) == 3: dict1 = kwargs['easyDict']['sites'][site][cS[0]]
-        elif len(cS) == 4: dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]]
-        elif len(cS) == 5: dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]]
-        elif len(cS) == 6: dict1 = kwargs['easyDict']['sites'][site][cS[0]][cS[1]][cS[2]][cS[3]]
-
-        for k, v in dict1.items():
-            for i in v:
-                if not i.get(cS[-1]):
-                    i[cS[-1]] = {}
-                if i[policy] == policy_name:
-                    i[cS[-1]].update(deepcopy(polVars))
-                    break
-        
-    if 'Grp_' in kwargs['site_group']:
-        if kwargs['easyDict']['site_groups'].get(kwargs['site_group']):
-            sites = kwargs['easyDict']['site_groups'][kwargs['site_group']]['sites']
-            for site in sites:
-                site_append(cS, site, polVars)
-        else: validating.error_site_group('site_group', **kwargs)
-    else: site_append(cS, kwargs['site_group'], polVars)
+        dict1 = path.get(site, -2)
+
+        i = ez_policy(dict1, path.keys[-2], policy, policy_name)
+        if i:
+            if not i.get(path.keys[-1]):
+                i[path.keys[-1]] = {}
+            i[path.keys[-1]].update(polVars)
 
     # Return Dictionary
-    return kwargs['easyDict']
+    return ez_sites(path.keys[0], site_append, **kwargs)
 
 #========================================================
-# Function to find the Keys for each Worksheet
-#========================================================
-def findKeys(ws, func_regex):
-    func_list = OrderedSet()
-    for i in ws.rows:
-        if any(i):
-            if re.search(func_regex, str(i[0].value)):
-                func_list.add(str(i[0].value))
-    return func_list
-
-#========================================================
-# Function to Create Terraform auto.tfvars files
-#========================================================
-def findVars(ws, func, rows, count):
-    var_list = []
-    var_dict = {}
-    for i in range(1, rows + 1):
-        if (ws.cell(row=i, column=1)).value == func:
-            try:
-                for x in range(2, 36):
-                    if (ws.cell(row=i - 1, column=x)).value:
-                        var_list.append(str(ws.cell(row=i - 1, column=x).value))
-                    else: x += 1
-            except Exception as e:
-                e = e
-                pass
-            break
-    vcount = 1
-    while vcount <= count:
-        var_dict[vcount] = {}
-        var_count = 0
-        for z in var_list:
-            var_dict[vcount][z] = ws.cell(row=i + vcount - 1, column=2 + var_count).value
-            var_count += 1
-        var_dict[vcount]['row'] = i + vcount - 1
-        vcount += 1
-    return var_dict
+# Function to get the SHA-256 Digest of a File
+#========================================================
+def file_sha256(filename):
+    file_hash = hashlib.sha256()
+    with open(filename, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+#========================================================
+# Function to Fingerprint Worksheet Rows or easyDict Data
+#========================================================
+def fingerprint(data):
+    return hashlib.sha256(repr(data).encode('utf-8')).hexdigest()
 
 #========================================================
 # Function to Merge Easy ACI Repository to Dest Folder
@@ -1133,6 +1675,9 @@ def git_base_repo(args, wb):
 # Function to Check the Git Status of the Folders
 #========================================================
 def git_check_status(args, site_names, site_directories):
+    # The Sites whose generated files changed come from the Manifest.  With
+    # --git-status, the Sites with uncommitted files under args.dir are added
+    changed = manifest_changes(args.dir, site_names)
     gitRepo = True
     args.git_check = True
     try:
@@ -1141,29 +1686,159 @@ def git_check_status(args, site_names, site_directories):
         print(f'\nError: {args.dir} is not a Git Repository\n Error {e}')
         args.git_check = False
         gitRepo = False
-    if gitRepo == True:
-        untrackedFiles = baseRepo.untracked_files
-        random_folders = []
-        modified = baseRepo.git.status()
-        modifiedList = [y for y in (x.strip() for x in modified.splitlines()) if y]
-        for site in site_names:
-            for x in site_directories:
-                if site in x:
-                    for line in modifiedList:
-                        if not x in random_folders and site in line: random_folders.append(x)  
-                    for line in untrackedFiles:
-                        if not x in random_folders and site in line: random_folders.append(x)
-        strict_folders = list(set(random_folders))
-        strict_folders.sort()
-        if not len(strict_folders) > 0:
-            print(f'\n-----------------------------------------------------------------------------\n')
-            print(f'   There were no uncommitted changes in the environment.')
-            print(f'   Proceedures Complete!!! Closing Environment and Exiting Script.')
-            print(f'\n-----------------------------------------------------------------------------\n')
-            exit()
-        return args, strict_folders, True
-    else: return args, [], False
-
+    if gitRepo == True and args.git_status == True:
+        changed.update(git_status_sites(baseRepo, args.dir, site_names))
+    strict_folders = [x for site, x in zip(site_names, site_directories) if site in changed]
+    if not len(strict_folders) > 0:
+        print(f'\n-----------------------------------------------------------------------------\n')
+        print(f'   There were no uncommitted changes in the environment.')
+        print(f'   Proceedures Complete!!! Closing Environment and Exiting Script.')
+        print(f'\n-----------------------------------------------------------------------------\n')
+        exit()
+    return args, strict_folders, gitRepo
+
+#========================================================
+# Function to get the Sites with uncommitted files from git
+#========================================================
+def git_status_sites(baseRepo, base_dir, site_names):
+    # One porcelain v2 status limited to base_dir.  The first path component
+    # under base_dir is matched to the Site names exactly
+    base_path = os.path.relpath(os.path.abspath(base_dir), baseRepo.working_tree_dir)
+    status = baseRepo.git.status('--porcelain=v2', '-z', '--untracked-files=all', '--', base_path)
+    records = status.split('\0')
+    sites = set()
+    skip = False
+    for record in records:
+        if skip or not record:
+            # The original path of a rename or copy
+            skip = False
+            continue
+        if record[0] == '1': path = record.split(' ', 8)[8]
+        elif record[0] == '2':
+            path = record.split(' ', 9)[9]
+            skip = True
+        elif record[0] == 'u': path = record.split(' ', 10)[10]
+        elif record[0] in ['?', '!']: path = record[2:]
+        else: continue
+        site = os.path.normpath(os.path.relpath(path, base_path)).split(os.sep)[0]
+        if site in site_names: sites.add(site)
+    return sites
+
+#========================================================
+# Function to Load the Generated File Manifest
+#========================================================
+def manifest_load(base_dir):
+    # The Manifest keeps the hash of every file the generators wrote for each
+    # applied Site, and what terraform fmt turned the .tf and .tfvars files into
+    manifest_file = os.path.join(base_dir, '.easy_aci_manifest.json')
+    manifest = {'formatted':{}, 'sites':{}}
+    if os.path.isfile(manifest_file):
+        try:
+            with open(manifest_file, 'r') as fh:
+                saved = json.load(fh)
+            if sorted(saved.keys()) == ['formatted', 'sites']: manifest = saved
+        except ValueError:
+            print(f'\n  Could not read {manifest_file}.  Treating every Site as changed.\n')
+    formatted_hashes.update(manifest['formatted'])
+    return manifest
+
+#========================================================
+# Function to get the Generated Files of a Site
+#========================================================
+def manifest_files(base_dir, site_name):
+    site_dir = os.path.join(base_dir, site_name)
+    files = {}
+    for file_path, content_hash in write_stats(site_name)['files'].items():
+        files[os.path.relpath(file_path, site_dir).replace(os.sep, '/')] = content_hash
+    return files
+
+#========================================================
+# Function to Compare the Generated Files to the Manifest
+#========================================================
+def manifest_changes(base_dir, site_names):
+    # The Manifest holds the files of each Site as they were when the Site
+    # was last applied.  A Site changed when any of its files has a new
+    # hash, so a Site that was skipped or failed is found again next run
+    manifest = manifest_load(base_dir)
+    changed = set()
+    hashes = set()
+    for site_name in site_names:
+        files = manifest_files(base_dir, site_name)
+        previous = manifest['sites'].get(site_name, {})
+        if previous == {} or any([not previous.get(k) == v for k, v in files.items()]):
+            changed.add(site_name)
+        hashes.update(files.values())
+    manifest['formatted'] = {k:v for k, v in formatted_hashes.items() if k in hashes}
+    manifest_save(base_dir, manifest)
+    return changed
+
+#========================================================
+# Function to Record the Sites that were Applied
+#========================================================
+def manifest_commit(base_dir, site_names):
+    if len(site_names) == 0: return
+    manifest = manifest_load(base_dir)
+    for site_name in site_names:
+        manifest['sites'][site_name] = manifest_files(base_dir, site_name)
+    manifest_save(base_dir, manifest)
+
+#========================================================
+# Function to Save the Generated File Manifest
+#========================================================
+def manifest_save(base_dir, manifest):
+    manifest_file = os.path.join(base_dir, '.easy_aci_manifest.json')
+    with open(manifest_file + '.tmp', 'w') as fh:
+        json.dump(manifest, fh, indent=4, sort_keys=True)
+    os.replace(manifest_file + '.tmp', manifest_file)
+
+#========================================================
+# Function to Load the Incremental Build State
+#========================================================
+def incremental_load(base_dir):
+    state_file = os.path.join(base_dir, '.easy_aci_state')
+    state = {'format':cache_format, 'global':None, 'processes':{}, 'snapshots':{}, 'yaml':{}}
+    if os.path.isfile(state_file):
+        try:
+            with open(state_file, 'rb') as fh:
+                saved = pickle.loads(zlib.decompress(fh.read()))
+            if saved.get('format') == cache_format:
+                state = saved
+        except Exception:
+            print(f'\n  Could not read {state_file}.  Processing all Worksheets.\n')
+    return state
+
+#========================================================
+# Function to Save the Incremental Build State
+#========================================================
+def incremental_save(base_dir, state):
+    state_file = os.path.join(base_dir, '.easy_aci_state')
+    with open(state_file + '.tmp', 'wb') as fh:
+        fh.write(zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)))
+    os.replace(state_file + '.tmp', state_file)
+
+#========================================================
+# Function to Index the Function Keys of a Worksheet
+#========================================================
+def index_worksheet(ws, func_regex):
+    # Walk the Worksheet one time and map each Function Key
+    # to its Header Row, Column Names and Data Rows
+    ws_index = {}
+    header = ()
+    for row_num, row in enumerate(ws.iter_rows(min_row=1, max_col=35, values_only=True), start=1):
+        func = str(row[0]) if row else 'None'
+        if re.search(func_regex, func):
+            if not ws_index.get(func):
+                columns = [str(x) for x in header[1:] if x]
+                # The Column Letter of each Header Cell, for reporting
+                letters = {}
+                for col_num, x in enumerate(header[1:], start=2):
+                    if x and not str(x) in letters: letters[str(x)] = openpyxl.utils.get_column_letter(col_num)
+                ws_index[func] = {'columns':columns, 'header':row_num - 1, 'letters':letters, 'rows':[]}
+            columns = ws_index[func]['columns']
+            values = tuple(row[1:len(columns) + 1])
+            ws_index[func]['rows'].append((row_num, values))
+        header = row
+    return ws_index
 
 #========================================================
 # Function to Create Interface Selector Workbooks
@@ -1346,20 +2021,7 @@ def interface_selector_workbook(polVars, **kwargs):
 def merge_easy_aci_repository(args, easy_jsonData, **easyDict):
     # Setup Operating Environment
     baseRepo = args.dir
-    opSystem = platform.system()
-    tfe_dir = 'tfe_modules'
-    if opSystem == 'Windows': path_sep = '\\'
-    else: path_sep = '/'
-    tfe_modules = f'{tfe_dir}{path_sep}modules'
-    git_url = "https://github.com/terraform-cisco-modules/easy-aci-complete"
-    if not os.path.isdir(tfe_dir):
-        os.mkdir(tfe_dir)
-        git.Repo.clone_from(git_url, tfe_dir)
-    if not os.path.isfile(os.path.join(tfe_dir, 'README.md')):
-        git.Repo.clone_from(git_url, tfe_dir)
-    else:
-        g = git.cmd.Git(tfe_dir)
-        g.pull()
+    module_dir = module_cache(args)
 
     # Get All sub-folders from tfDir
     site_list = list(easyDict['sites'].keys())
@@ -1379,18 +2041,111 @@ def merge_easy_aci_repository(args, easy_jsonData, **easyDict):
         for folder in [site_name, 'defaults']:
             if folder == 'defaults':
                 dest_dir = os.path.join(baseRepo, site_name, folder)
-                src_dir = os.path.join(tfe_dir, 'defaults')
+                src_dir = os.path.join(module_dir, 'defaults')
             else:
                 dest_dir = os.path.join(baseRepo, site_name)
-                src_dir = os.path.join(tfe_dir)
+                src_dir = os.path.join(module_dir)
             copy_files = os.listdir(src_dir)
             for fname in copy_files:
                 if not os.path.isdir(os.path.join(src_dir, fname)):
-                    shutil.copy2(os.path.join(src_dir, fname), dest_dir)
-        terraform_fmt(site_dir)
+                    link_output(os.path.join(src_dir, fname), os.path.join(dest_dir, fname), write_stats(site_name))
     # Return Site Names and Site Directories
     return site_names, site_directories
 
+#========================================================
+# Function to get the Module Files of the Pinned Version
+#========================================================
+def module_cache(args):
+    # The easy-aci-complete files are kept for each commit under
+    # ~/.easy_aci/modules.  The Repository is only fetched when the pin
+    # changes, or with --refresh-modules, so most runs never use the network
+    cache_dir = os.path.join(os.path.expanduser('~'), '.easy_aci', 'modules')
+    pin_file = os.path.join(cache_dir, 'pin.json')
+    pin = {}
+    if os.path.isfile(pin_file):
+        with open(pin_file, 'r') as fh:
+            pin = json.load(fh)
+    ref = args.modules_ref
+    if ref == None: ref = pin.get('ref', 'HEAD')
+    module_dir = os.path.join(cache_dir, str(pin.get('commit')))
+    if pin.get('ref') == ref and os.path.isdir(module_dir) and not args.refresh_modules == True:
+        return module_dir
+
+    # Sync the Repository and resolve the pin to a commit
+    print(f'\n-----------------------------------------------------------------------------\n')
+    print(f'  Syncing the Terraform Modules from {modules_url} at "{ref}".')
+    print(f'\n-----------------------------------------------------------------------------\n')
+    repo_dir = os.path.join(cache_dir, 'easy-aci-complete')
+    if not os.path.isdir(os.path.join(repo_dir, '.git')):
+        git.Repo.clone_from(modules_url, repo_dir)
+    repo = git.Repo(repo_dir)
+    repo.git.fetch('--force', '--tags', 'origin')
+    try:
+        commit = repo.git.rev_parse(f'origin/{ref}^{{commit}}')
+    except git.exc.GitCommandError:
+        commit = repo.git.rev_parse(f'{ref}^{{commit}}')
+
+    # Export the top level and defaults files of the commit one time
+    module_dir = os.path.join(cache_dir, commit)
+    if not os.path.isdir(module_dir):
+        tree = repo.commit(commit).tree
+        os.makedirs(os.path.join(module_dir + '.tmp', 'defaults'), exist_ok=True)
+        folders = [('', tree)]
+        if 'defaults' in [x.name for x in tree.trees]: folders.append(('defaults', tree['defaults']))
+        for folder, folder_tree in folders:
+            for blob in folder_tree.blobs:
+                with open(os.path.join(module_dir + '.tmp', folder, blob.name), 'wb') as fh:
+                    fh.write(blob.data_stream.read())
+        os.replace(module_dir + '.tmp', module_dir)
+    with open(pin_file, 'w') as fh:
+        json.dump({'commit':commit, 'ref':ref}, fh, indent=4)
+    return module_dir
+
+#========================================================
+# Function to Link a Module File into a Site
+#========================================================
+def link_output(src_file, file_path, stats):
+    # Module Files are hard linked from the Module Cache, cloned where the
+    # filesystem supports copy on write, or else copied.  Files already the
+    # same are skipped.  write_output replaces files rather than writing
+    # into them, so the linked files of the Cache are never changed
+    if not src_file in module_hashes:
+        module_hashes[src_file] = file_sha256(src_file)
+    stats['files'][file_path] = module_hashes[src_file]
+    if os.path.isfile(file_path):
+        if os.path.samefile(src_file, file_path) or (os.path.getsize(file_path) == os.path.getsize(src_file)
+            and file_sha256(file_path) == module_hashes[src_file] and filecmp.cmp(src_file, file_path, shallow=False)):
+            stats['skipped'] += 1
+            return False
+    tmp_file = file_path + '.tmp'
+    if os.path.lexists(tmp_file): os.remove(tmp_file)
+    try:
+        os.link(src_file, tmp_file)
+    except OSError:
+        try: clone_file(src_file, tmp_file)
+        except OSError: shutil.copy2(src_file, tmp_file)
+    os.replace(tmp_file, file_path)
+    stats['written'] += 1
+    return True
+
+#========================================================
+# Function to Clone a File with Copy on Write
+#========================================================
+def clone_file(src_file, file_path):
+    # The FICLONE ioctl of Linux (btrfs, xfs and others), OSError elsewhere
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError('Copy on write clones are not supported on this platform.')
+    with open(src_file, 'rb') as src, open(file_path, 'wb') as dest:
+        try:
+            fcntl.ioctl(dest.fileno(), 0x40049409, src.fileno())
+        except OSError:
+            dest.close()
+            os.remove(file_path)
+            raise
+    shutil.copystat(src_file, file_path)
+
 #========================================================
 # Function to GET to the NDO API
 #========================================================
@@ -1418,6 +2173,10 @@ def ndo_api(ndo, method, cookies, uri, section=''):
 # Function to validate input for each method
 #========================================================
 def process_kwargs(jsonData, **kwargs):
+    # Stop the Handler here when only Validating the Workbook
+    if kwargs['easyDict'].get('validate_only') == True:
+        raise ValidationComplete(validate_errors(jsonData, **kwargs))
+
     # Validate User Input
     validate_args(jsonData, **kwargs)
     
@@ -1484,11 +2243,10 @@ def process_kwargs(jsonData, **kwargs):
     polVars = {**required_args, **optional_args}
 
     if kwargs['easyDict']['remove_default_args'] == True:
-        Dicts = deepcopy(polVars)
-        for k,v in Dicts.items():
-            if jsonData.get(k):
-                if not jsonData[k].get('default') == None:
-                    if v == jsonData[k]['default']:
+        for k,v in list(polVars.items()):
+            if isinstance(jsonData.get(k), validating.schema_property):
+                if not jsonData[k].default == None:
+                    if v == jsonData[k].default:
                         polVars.pop(k)
     return(polVars)
 
@@ -1533,47 +2291,16 @@ def process_workbook(polVars, **kwargs):
 #========================================================
 # Function to Read Excel Workbook Data
 #========================================================
-def read_in(excel_workbook):
+def read_in(excel_workbook, read_only=True):
+    # Worksheets are only read by the handlers, so stream them in read-only
+    # mode by default.  Use read_only=False where the workbook is modified.
     try:
-        wb = load_workbook(excel_workbook)
+        wb = load_workbook(excel_workbook, read_only=read_only)
     except Exception as e:
         print(f"Something went wrong while opening the workbook - {excel_workbook}... ABORT!")
         sys.exit(e)
     return wb
 
-#========================================================
-# Function to Read the Worksheet and Create Templates
-#========================================================
-def read_worksheet(class_init, class_folder, easyDict, easy_jsonData, func_regex, wb, ws):
-    rows = ws.max_row
-    func_list = findKeys(ws, func_regex)
-    stdout_log(ws, None, 'begin')
-    for func in func_list:
-        count = countKeys(ws, func)
-        var_dict = findVars(ws, func, rows, count)
-        for pos in var_dict:
-            row_num = var_dict[pos]['row']
-            del var_dict[pos]['row']
-            for x in list(var_dict[pos].keys()):
-                if var_dict[pos][x] == '':
-                    del var_dict[pos][x]
-            stdout_log(ws, row_num, 'begin')
-            var_dict[pos].update(
-                {
-                    'class_folder':class_folder,
-                    'easyDict':easyDict,
-                    'easy_jsonData':easy_jsonData,
-                    'row_num':row_num,
-                    'wb':wb,
-                    'ws':ws
-                }
-            )
-            easyDict = eval(f"{class_init}(class_folder).{func}(**var_dict[pos])")
-    
-    stdout_log(ws, None, 'end')
-    # Return the easyDict
-    return easyDict
-
 #========================================================
 # Function to loop through site_groups for sensitve vars
 #========================================================
@@ -1736,7 +2463,7 @@ def sensitive_var_value(**kwargs):
 #========================================================
 # Function to Define stdout_log output
 #========================================================
-def stdout_log(ws, row_num, spot):
+def stdout_log(ws, row_num, spot, detail=None):
     if log_level == 0:
         return
     elif ((log_level == (1) or log_level == (2)) and
@@ -1748,6 +2475,8 @@ def stdout_log(ws, row_num, spot):
         print(f'\n-----------------------------------------------------------------------------\n')
         print(f'   Completed Worksheet "{ws.title}" evaluation...')
         print(f'\n-----------------------------------------------------------------------------')
+    elif (log_level == (1) or log_level == (2)) and spot == 'site':
+        print(f'   {detail}')
     elif log_level == (2) and (ws) and (row_num is not None):
         if re.fullmatch('[0-9]', str(row_num)):
             print(f'    - Evaluating Row   {row_num}...')
@@ -1871,226 +2600,226 @@ def tfc_api(url, method, payload, site_header, section=''):
 #========================================================
 # Function to Format Terraform Files
 #========================================================
-def terraform_fmt(folder):
-    # Run terraform fmt to cleanup the formating for all of the auto.tfvar files and tf files if needed
+def terraform_fmt(args):
+    # One terraform fmt for each directory, over only the .tf and .tfvars
+    # files the generators wrote on this run, in a bounded pool
+    folders = {}
+    raw_hashes = {}
+    for site_name, stats in output_stats.items():
+        for file_path in stats['changed']:
+            if re.search(r'\.tf(vars)?$', file_path):
+                folders.setdefault(os.path.dirname(file_path), []).append(file_path)
+                raw_hashes[file_path] = stats['files'][file_path]
+    if len(folders) == 0: return
     print(f'\n-----------------------------------------------------------------------------\n')
-    print(f'  Running "terraform fmt" in folder "{folder}",')
+    print(f'  Running "terraform fmt" on the {len(raw_hashes)} changed files in {len(folders)} folders,')
     print(f'  to correct variable formatting!')
     print(f'\n-----------------------------------------------------------------------------\n')
-    p = subprocess.Popen(
-        ['terraform', 'fmt', folder],
-        stdout = subprocess.PIPE,
-        stderr = subprocess.PIPE
-    )
-    print('Format updated for the following Files:')
-    for line in iter(p.stdout.readline, b''):
-        line = line.decode("utf-8")
-        line = line.strip()
-        print(f'- {line}')
+    folder_list = sorted(folders.keys())
+    if args.jobs > 1: workers = args.jobs
+    else: workers = os.cpu_count()
+    with ThreadPoolExecutor(max_workers=min(workers, len(folder_list))) as executor:
+        results = list(executor.map(terraform_fmt_folder, folder_list, [sorted(folders[x]) for x in folder_list]))
+    for folder, result in zip(folder_list, results):
+        if not result['returncode'] == 0:
+            print(f'\n-----------------------------------------------------------------------------\n')
+            print(f'   Error!!! "terraform fmt" failed in "{folder}" after {result["elapsed"]:.3f}s:\n')
+            for line in result['errors']: print(f'   {line}')
+            print(f'\n-----------------------------------------------------------------------------\n')
+            continue
+        stdout_log(None, None, 'site', f'terraform fmt "{folder}": {len(folders[folder])} files checked, '
+            f'{len(result["formatted"])} formatted in {result["elapsed"]:.3f}s')
+        for line in result['formatted']: print(f'   - {line}')
+
+        # Remember what fmt made of each file, so the next run sees it as unchanged
+        for file_path in folders[folder]:
+            formatted_hash = file_sha256(file_path)
+            if not formatted_hash == raw_hashes[file_path]: formatted_hashes[raw_hashes[file_path]] = formatted_hash
 
 #========================================================
-# Function to Validate Worksheet User Input
+# Function to Run terraform fmt in one Directory
 #========================================================
-def validate_args(jsonData, **kwargs):
-    globalData = kwargs['easy_jsonData']['globalData']['allOf'][1]['properties']
-    global_args = [
-        'admin_state',
-        'application_epg',
-        'application_profile',
-        'annotation',
-        'annotations',
-        'audit_logs',
-        'bridge_domain',
-        'cdp_interface_policy',
-        'description',
-        'events',
-        'faults',
-        'global_alias',
-        'l3out',
-        'lldp_interface_policy',
-        'login_domain',
-        'management_epg',
-        'management_epg_type',
-        'monitoring_policy',
-        'name',
-        'name_alias',
-        'node_id',
-        'pod_id',
-        'policies_tenant',
-        'policy_name',
-        'profile_name',
-        'port_channel_policy',
-        'qos_class',
-        'schema',
-        'session_logs',
-        'sites',
-        'target_dscp',
-        'template',
-        'tenant',
-        'username',
-        'vrf'
-    ]
-    for i in jsonData['required_args']:
-        if i in global_args:
-            if globalData[i]['type'] == 'boolean':
-                if not (kwargs[i] == None or kwargs[i] == ''):
-                    validating.boolean(i, **kwargs)
-            elif globalData[i]['type'] == 'integer':
-                if kwargs[i] == None:
-                    kwargs[i] = globalData[i]['default']
-                else:
-                    validating.number_check(i, globalData, **kwargs)
-            elif globalData[i]['type'] == 'key_value':
-                if not (kwargs[i] == None or kwargs[i] == ''):
-                    validating.key_value(i, globalData, **kwargs)
-            elif globalData[i]['type'] == 'list_of_string':
-                if not (kwargs[i] == None or kwargs[i] == ''):
-                    validating.string_list(i, globalData, **kwargs)
-            elif globalData[i]['type'] == 'list_of_values':
-                if kwargs[i] == None:
-                    kwargs[i] = globalData[i]['default']
-                else:
-                    validating.list_values(i, globalData, **kwargs)
-            elif globalData[i]['type'] == 'string':
-                if not (kwargs[i] == None or kwargs[i] == ''):
-                    validating.string_pattern(i, globalData, **kwargs)
-            else:
-                print(f'error validating.  Type not found {i}. 1')
-                exit()
-        elif i == 'site_group':
-            validating.site_group('site_group', **kwargs)
-        elif jsonData[i]['type'] == 'boolean':
-            if not (kwargs[i] == None or kwargs[i] == ''):
-                validating.boolean(i, **kwargs)
-        elif jsonData[i]['type'] == 'hostname':
-            if not (kwargs[i] == None or kwargs[i] == ''):
-                if ':' in kwargs[i]:
-                    validating.ip_address(i, **kwargs)
-                elif re.search('[a-z]', kwargs[i], re.IGNORECASE):
-                    validating.dns_name(i, **kwargs)
-                else:
-                    validating.ip_address(i, **kwargs)
-        elif jsonData[i]['type'] == 'email':
-            if not (kwargs[i] == None or kwargs[i] == ''):
-                validating.email(i, **kwargs)
-        elif jsonData[i]['type'] == 'integer':
-            if kwargs[i] == None:
-                kwargs[i] = jsonData[i]['default']
-            else:
-                validating.number_check(i, jsonData, **kwargs)
-        elif jsonData[i]['type'] == 'list_of_domains':
-            if not (kwargs[i] == None or kwargs[i] == ''):
-                count = 1
-                for domain in kwargs[i]:
-                    kwargs[f'domain_{count}'] = domain
-                    validating.domain(f'domain_{count}', **kwargs)
-                    kwargs.pop(f'domain_{count}')
-                    count += 1
-        elif jsonData[i]['type'] == 'list_of_hosts':
-            if not (kwargs[i] == None or kwargs[i] == ''):
-                count = 1
-                for hostname in kwargs[i].split(','):
-                    kwargs[f'{i}_{count}'] = hostname
-                    if ':' in hostname:
-                        validating.ip_address(f'{i}_{count}', **kwargs)
-                    elif re.search('[a-z]', hostname, re.IGNORECASE):
-                        validating.dns_name(f'{i}_{count}', **kwargs)
-                    else:
-                        validating.ip_address(f'{i}_{count}', **kwargs)
-                    kwargs.pop(f'{i}_{count}')
-                    count += 1
-        elif jsonData[i]['type'] == 'list_of_integer':
-            if kwargs[i] == None:
-                kwargs[i] = jsonData[i]['default']
-            else:
-                validating.number_list(i, jsonData, **kwargs)
-        elif jsonData[i]['type'] == 'list_of_string':
-            if not (kwargs[i] == None or kwargs[i] == ''):
-                validating.string_list(i, jsonData, **kwargs)
-        elif jsonData[i]['type'] == 'list_of_values':
-            if kwargs[i] == None:
-                kwargs[i] = jsonData[i]['default']
-            else:
-                validating.list_values(i, jsonData, **kwargs)
-        elif jsonData[i]['type'] == 'list_of_vlans':
-            if not (kwargs[i] == None or kwargs[i] == ''):
-                validating.vlans(i, **kwargs)
-        elif jsonData[i]['type'] == 'string':
+def terraform_fmt_folder(folder, files):
+    start = time.perf_counter()
+    p = subprocess.run(
+        ['terraform', 'fmt', '-no-color'] + [os.path.basename(x) for x in files],
+        cwd = folder, stdout = subprocess.PIPE, stderr = subprocess.PIPE
+    )
+    # The Files are only listed as formatted when terraform fmt succeeded
+    if p.returncode == 0: formatted = [x.strip() for x in p.stdout.decode('utf-8').splitlines() if x.strip()]
+    else: formatted = []
+    errors = [x.rstrip() for x in p.stderr.decode('utf-8').splitlines() if x.strip()]
+    return {'elapsed':time.perf_counter() - start, 'errors':errors, 'formatted':formatted, 'returncode':p.returncode}
+
+#========================================================
+# Validators for each Argument Type
+#========================================================
+def validate_domains(i, rules, kwargs):
+    count = 1
+    for domain in kwargs[i]:
+        validating.domain(f'domain_{count}', **{'row_num':kwargs['row_num'], 'ws':kwargs['ws'], f'domain_{count}':domain})
+        count += 1
+
+def validate_host(var, hostname, kwargs):
+    item = {'row_num':kwargs['row_num'], 'ws':kwargs['ws'], var:hostname}
+    if ':' in hostname:
+        validating.ip_address(var, **item)
+    elif letters_regex.search(hostname):
+        validating.dns_name(var, **item)
+    else:
+        validating.ip_address(var, **item)
+
+def validate_hosts(i, rules, kwargs):
+    count = 1
+    for hostname in kwargs[i].split(','):
+        validate_host(f'{i}_{count}', hostname, kwargs)
+        count += 1
+
+def validate_macs(i, rules, kwargs):
+    count = 1
+    for mac in kwargs[i].split(','):
+        validating.mac_address(f'{i}_{count}', **{'row_num':kwargs['row_num'], 'ws':kwargs['ws'], f'{i}_{count}':mac})
+        count += 1
+
+letters_regex = re.compile('[a-z]', re.IGNORECASE)
+module_regex = re.compile(r'^module_[\d]+$')
+type_validators = {
+    'boolean': lambda i, rules, kwargs: validating.boolean(i, **kwargs),
+    'domain': lambda i, rules, kwargs: validating.domain(i, **kwargs),
+    'email': lambda i, rules, kwargs: validating.email(i, **kwargs),
+    'hostname': lambda i, rules, kwargs: validate_host(i, kwargs[i], kwargs),
+    'integer': lambda i, rules, kwargs: validating.number_check(i, rules, **kwargs),
+    'key_value': lambda i, rules, kwargs: validating.key_value(i, rules, **kwargs),
+    'list_of_domains': validate_domains,
+    'list_of_hosts': validate_hosts,
+    'list_of_integer': lambda i, rules, kwargs: validating.number_list(i, rules, **kwargs),
+    'list_of_macs': validate_macs,
+    'list_of_string': lambda i, rules, kwargs: validating.string_list(i, rules, **kwargs),
+    'list_of_values': lambda i, rules, kwargs: validating.list_values(i, rules, **kwargs),
+    'list_of_vlans': lambda i, rules, kwargs: validating.vlans(i, **kwargs),
+    'mac_address': lambda i, rules, kwargs: validating.mac_address(i, **kwargs),
+    'phone_number': lambda i, rules, kwargs: validating.phone_number(i, **kwargs),
+    'string': lambda i, rules, kwargs: validating.string_pattern(i, rules, **kwargs)
+}
+
+# The Types accepted for Required/Optional and global/Schema Arguments.
+# 'blank' skips None and '' values, 'none' only skips None.
+required_global_types = {
+    'boolean':'blank', 'integer':'none', 'key_value':'blank', 'list_of_string':'blank',
+    'list_of_values':'none', 'string':'blank'
+}
+required_types = {
+    'boolean':'blank', 'email':'blank', 'hostname':'blank', 'integer':'none', 'list_of_domains':'blank',
+    'list_of_hosts':'blank', 'list_of_integer':'none', 'list_of_string':'blank', 'list_of_values':'none',
+    'list_of_vlans':'blank', 'string':'blank'
+}
+optional_global_types = dict.fromkeys(['integer', 'key_value', 'list_of_string', 'list_of_values', 'string'], 'blank')
+optional_types = dict.fromkeys([
+    'boolean', 'domain', 'email', 'hostname', 'integer', 'list_of_hosts', 'list_of_integer', 'list_of_macs',
+    'list_of_string', 'list_of_values', 'list_of_vlans', 'mac_address', 'phone_number', 'string'
+], 'blank')
+
+#========================================================
+# Function to Build the Validation Check of an Argument
+#========================================================
+def validate_check(i, required, jsonData, globalData):
+    if i in global_args:
+        rules = globalData
+        if required == True: types, error = required_global_types, f'error validating.  Type not found {i}. 1'
+        else: types, error = optional_global_types, None
+    elif required == True and i == 'site_group':
+        return lambda kwargs: validating.site_group(i, **kwargs)
+    elif required == False and module_regex.search(i):
+        def check(kwargs):
             if not (kwargs[i] == None or kwargs[i] == ''):
-                validating.string_pattern(i, jsonData, **kwargs)
-        else:
-            print(f"error validating.  Type not found {jsonData[i]['type']}. 2.")
-            exit()
-    for i in jsonData['optional_args']:
-        if not (kwargs[i] == None or kwargs[i] == ''):
-            if i in global_args:
-                if globalData[i]['type'] == 'integer':
-                    validating.number_check(i, globalData, **kwargs)
-                elif globalData[i]['type'] == 'key_value':
-                    validating.key_value(i, globalData, **kwargs)
-                elif globalData[i]['type'] == 'list_of_string':
-                    validating.string_list(i, globalData, **kwargs)
-                elif globalData[i]['type'] == 'list_of_values':
-                    validating.list_values(i, globalData, **kwargs)
-                elif globalData[i]['type'] == 'string':
-                    validating.string_pattern(i, globalData, **kwargs)
-                else:
-                    validating.validator(i, **kwargs)
-            elif re.search(r'^module_[\d]+$', i):
                 validating.list_values_key('modules', i, jsonData, **kwargs)
-            elif jsonData[i]['type'] == 'boolean':
-                validating.boolean(i, **kwargs)
-            elif jsonData[i]['type'] == 'domain':
-                validating.domain(i, **kwargs)
-            elif jsonData[i]['type'] == 'email':
-                validating.email(i, **kwargs)
-            elif jsonData[i]['type'] == 'hostname':
-                if ':' in kwargs[i]:
-                    validating.ip_address(i, **kwargs)
-                elif re.search('[a-z]', kwargs[i], re.IGNORECASE):
-                    validating.dns_name(i, **kwargs)
-                else:
-                    validating.ip_address(i, **kwargs)
-            elif jsonData[i]['type'] == 'integer':
-                validating.number_check(i, jsonData, **kwargs)
-            elif jsonData[i]['type'] == 'list_of_integer':
-                validating.number_list(i, jsonData, **kwargs)
-            elif jsonData[i]['type'] == 'list_of_hosts':
-                count = 1
-                for hostname in kwargs[i].split(','):
-                    kwargs[f'{i}_{count}'] = hostname
-                    if ':' in hostname:
-                        validating.ip_address(f'{i}_{count}', **kwargs)
-                    elif re.search('[a-z]', hostname, re.IGNORECASE):
-                        validating.dns_name(f'{i}_{count}', **kwargs)
-                    else:
-                        validating.ip_address(f'{i}_{count}', **kwargs)
-                    kwargs.pop(f'{i}_{count}')
-                    count += 1
-            elif jsonData[i]['type'] == 'list_of_macs':
-                count = 1
-                for mac in kwargs[i].split(','):
-                    kwargs[f'{i}_{count}'] = mac
-                    validating.mac_address(f'{i}_{count}', **kwargs)
-                    kwargs.pop(f'{i}_{count}')
-                    count += 1
-            elif jsonData[i]['type'] == 'list_of_string':
-                validating.string_list(i, jsonData, **kwargs)
-            elif jsonData[i]['type'] == 'list_of_values':
-                validating.list_values(i, jsonData, **kwargs)
-            elif jsonData[i]['type'] == 'list_of_vlans':
-                validating.vlans(i, **kwargs)
-            elif jsonData[i]['type'] == 'mac_address':
-                validating.mac_address(i, **kwargs)
-            elif jsonData[i]['type'] == 'phone_number':
-                validating.phone_number(i, **kwargs)
-            elif jsonData[i]['type'] == 'string':
-                validating.string_pattern(i, jsonData, **kwargs)
-            else:
-                print(f"error validating.  Type not found {jsonData[i]['type']}. 3.")
+        return check
+    else:
+        rules = jsonData
+        if required == True: types, error = required_types, '2.'
+        else: types, error = optional_types, '3.'
+
+    try:
+        arg_type = rules[i]['type']
+    except KeyError:
+        # Keep the KeyError for when the Argument is actually validated
+        def check(kwargs):
+            if required == True or not (kwargs[i] == None or kwargs[i] == ''):
+                rules[i]['type']
+        return check
+
+    if arg_type in types:
+        skip_blank = types[arg_type] == 'blank' or required == False
+        validator = type_validators[arg_type]
+        def check(kwargs):
+            value = kwargs[i]
+            if not (value == None or (skip_blank and value == '')):
+                validator(i, rules, kwargs)
+    elif error == None:
+        def check(kwargs):
+            if not (kwargs[i] == None or kwargs[i] == ''):
+                validating.validator(i, **kwargs)
+    else:
+        if not i in global_args: error = f'error validating.  Type not found {arg_type}. {error}'
+        def check(kwargs):
+            if required == True or not (kwargs[i] == None or kwargs[i] == ''):
+                print(error)
                 exit()
+    return check
+
+#========================================================
+# Function to Get the Validation Plan of a Schema
+#========================================================
+def validate_plan(jsonData, easy_jsonData):
+    # The Plan is built once per set of Required/Optional Arguments; some
+    # Handlers add or remove Arguments with args_add/args_remove.
+    plan_key = (tuple(jsonData['required_args']), tuple(jsonData['optional_args']))
+    plans = getattr(jsonData, 'plans', {})
+    if not plan_key in plans:
+        globalData = easy_jsonData['globalData']['allOf'][1]['properties']
+        plans[plan_key] = [(i, validate_check(i, True, jsonData, globalData)) for i in jsonData['required_args']]
+        plans[plan_key].extend([(i, validate_check(i, False, jsonData, globalData)) for i in jsonData['optional_args']])
+    return plans[plan_key]
+
+#========================================================
+# Function to Validate Worksheet User Input
+#========================================================
+def validate_args(jsonData, **kwargs):
+    for i, check in validate_plan(jsonData, kwargs['easy_jsonData']):
+        check(kwargs)
     return kwargs
 
+#========================================================
+# Function to Collect every Validation Error of a Row
+#========================================================
+def validate_errors(jsonData, **kwargs):
+    # Same checks as process_kwargs/validate_args, but the Errors are
+    # returned as (key, message) instead of exiting on the first one.
+    errors = []
+    for i, check in validate_plan(jsonData, kwargs['easy_jsonData']):
+        if not i in kwargs.keys():
+            errors.append((i, f'The Column "{i}" was not found in the Worksheet Header.'))
+            continue
+        elif i in jsonData['required_args'] and kwargs[i] == None:
+            errors.append((i, f'"{i}" is a REQUIRED Argument and is Blank.'))
+            continue
+        output = io.StringIO()
+        try:
+            with redirect_stdout(output):
+                check(kwargs)
+        except SystemExit:
+            errors.append((i, validate_message(output.getvalue())))
+        except Exception as e:
+            errors.append((i, f'"{kwargs[i]}" could not be validated: {type(e).__name__} {e}'))
+    return errors
+
+#========================================================
+# Function to Condense a printed Error Banner to one Line
+#========================================================
+def validate_message(output):
+    message = [x.strip() for x in output.splitlines() if x.strip().strip('-')]
+    return ' '.join(message).replace('Exiting....', '').strip()
+
 #========================================================
 # Function to pull variables from easy_jsonData
 #========================================================
@@ -2307,6 +3036,22 @@ def vlan_range(vlan_list, **polVars):
         results = 'false'
         return results
 
+#========================================================
+# Function to get the Jinja2 Environment of a Template Directory
+#========================================================
+def template_env(class_type):
+    # One Environment per Template Directory for the whole Process.  The
+    # compiled Templates are kept in a Bytecode Cache under ~/.easy_aci, so
+    # the next run does not compile them again
+    if not class_type in template_envs:
+        cache_dir = os.path.join(os.path.expanduser('~'), '.easy_aci', 'jinja2')
+        os.makedirs(cache_dir, exist_ok=True)
+        template_envs[class_type] = jinja2.Environment(
+            bytecode_cache = jinja2.FileSystemBytecodeCache(cache_dir),
+            loader = jinja2.FileSystemLoader(pkg_resources.resource_filename('classes', f'templates/{class_type}/'))
+        )
+    return template_envs[class_type]
+
 #========================================================
 # Function to Determine which sites to write files to.
 #========================================================
@@ -2318,13 +3063,8 @@ def write_to_site(polVars, **kwargs):
     dest_file  = kwargs["tf_file"]
     site_name  = kwargs["site_name"]
 
-    aci_template_path = pkg_resources.resource_filename(f'classes', 'templates/')
-    templateLoader = jinja2.FileSystemLoader(
-        searchpath=(aci_template_path + '%s/') % (class_type))
-    templateEnv = jinja2.Environment(loader=templateLoader)
-    
     # Define the Template Source
-    template = templateEnv.get_template(kwargs["template_file"])
+    template = template_env(class_type).get_template(kwargs["template_file"])
 
     # Make sure the Destination Path and Folder Exist
     if not os.path.isdir(os.path.join(baseRepo, site_name, dest_dir)):
@@ -2334,15 +3074,9 @@ def write_to_site(polVars, **kwargs):
         dest_path = f'{os.path.join(baseRepo, site_name)}{path_sep}{dest_dir}'
         os.makedirs(dest_path)
     dest_dir = os.path.join(baseRepo, site_name, dest_dir)
-    if not os.path.exists(os.path.join(dest_dir, dest_file)):
-        create_file = f'type nul >> {os.path.join(dest_dir, dest_file)}'
-        os.system(create_file)
     tf_file = os.path.join(dest_dir, dest_file)
-    wr_file = open(tf_file, 'w')
 
     # Render Payload and Write to File
-    polVars = json.loads(json.dumps(polVars))
     polVars = {'keys':polVars}
     payload = template.render(polVars)
-    wr_file.write(payload)
-    wr_file.close()
+    write_output(tf_file, payload, write_stats(site_name))
@@ -5,19 +5,32 @@ It uses argparse to take in the following CLI arguments:
     d or dir:        Base Directory to use for creation of the HCL Configuration Files
     s or skip-version-check: Adding this Flag will disable the login to the controllers to determine the running version.
     w or workbook:   Name of Excel Workbook file for the Data Source
+    cd or cache-dir: Directory for the parsed Workbook cache
+    cs or cache-size: Maximum size of the parsed Workbook cache in MB
+    i or incremental: Only process the Worksheets that changed since the last run
+    j or jobs:       Number of worker processes used to evaluate the Worksheets
+    lf or list-functions: List the Function Keys each Worksheet Handler Class accepts
+    vo or validate-only: Report every Validation Error in the Workbook without building the Configuration
+    vr or validate-report: JSON file to also write the Validation Errors to
+    vs or validator-stats: Print the Hit Rates of the memoized Validators
 """
 
 #======================================================
 # Source Modules
 #======================================================
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import redirect_stdout
 import argparse
 import classes
 import easy_functions
+import io
 import json
 import os
+import pickle
 import platform
 import re
 import sys
+import validating
 
 #======================================================
 # Regular Expressions to Control wich rows in the
@@ -51,6 +64,173 @@ tenants_regex = '^(ndo_schema|(template|tenant)_(add|site)|vrf_(add|community|te
 tenant_pol_regex = '^(apic_inb|bgp_pfx|dhcp_relay|(eigrp|ospf)_interface)$'
 virtual_regex = '^(vmm_(controllers|creds|domain|elagp|vswitch))$'
 
+#======================================================
+# Worksheets read by each Process, the Site Keys of the
+# easyDict that the Process Handlers populate and the
+# Processes that must complete before it can start.
+# The Sites Worksheet is always processed first.
+#======================================================
+process_map = {
+    'access': {'depends':[], 'site_keys':['access'], 'worksheets':['Access']},
+    'admin': {'depends':[], 'site_keys':['admin'], 'worksheets':['Admin']},
+    'fabric': {'depends':[], 'site_keys':['fabric'], 'worksheets':['Fabric']},
+    'switches': {
+        'depends':['access'], 'site_keys':['switch'], 'site_workbooks':True, 'worksheets':['Switch Profiles']
+    },
+    'system_settings': {'depends':[], 'site_keys':['system_settings'], 'worksheets':['System Settings']},
+    'tenants': {'depends':['access'], 'site_keys':['templates', 'tenants'], 'tmp':True, 'worksheets':['Tenants']},
+    'virtual_networking': {'depends':[], 'site_keys':['virtual_networking'], 'worksheets':['Virtual Networking']}
+}
+
+#======================================================
+# Handler Classes and the Class Folder each is
+# initialized with.  One instance of each is shared by
+# every row of the Worksheets.
+#======================================================
+handler_classes = [
+    ('access', 'access'),
+    ('admin', 'admin'),
+    ('fabric', 'fabric'),
+    ('site_policies', 'sites'),
+    ('switches', 'switches'),
+    ('system_settings', 'system_settings'),
+    ('tenants', 'tenants')
+]
+
+#======================================================
+# The Schema in easy_jsonData that holds the Arguments
+# of each Handler Function.
+#======================================================
+handler_schemas = {
+    'access': {
+        'global_aaep':'access.global.attachableAccessEntityProfile',
+        'l3_domains':'access.domains.Layer3',
+        'leaf_pg':'access.switches.leafPolicyGroup',
+        'pg_access':'access.policyGroups.leafAccessPort',
+        'pg_breakout':'access.policyGroups.leafBreakOut',
+        'pg_bundle':'access.policyGroups.leafBundles',
+        'pg_spine':'access.policyGroups.spineAccessPort',
+        'pg_template':'access.policyGroups.leafBundleTemplate',
+        'phys_domains':'access.domains.Physical',
+        'pol_cdp':'access.policies.cdpInterface',
+        'pol_fc':'access.policies.fibreChannelInterface',
+        'pol_l2':'access.policies.L2Interface',
+        'pol_link_level':'access.policies.linkLevel',
+        'pol_lldp':'access.policies.lldpInterface',
+        'pol_mcp':'access.policies.mcpInterface',
+        'pol_port_ch':'access.policies.PortChannel',
+        'pol_port_sec':'access.policies.portSecurity',
+        'pol_stp':'access.policies.spanningTreeInterface',
+        'pre_built':'access.preBuiltPolicies',
+        'spine_pg':'access.switches.spinePolicyGroup',
+        'vlan_pools':'access.pools.Vlan',
+        'vmm_controllers':'access.vmm.Controllers',
+        'vmm_creds':'access.vmm.Credentials',
+        'vmm_domain':'access.vmm.Domains',
+        'vmm_elagp':'access.vmm.enhancedLag',
+        'vmm_vswitch':'access.vmm.vswitchPolicy'
+    },
+    'admin': {
+        'auth':'admin.Authentication',
+        'export_policy':'admin.exportPolicy',
+        'maint_group':'admin.firmware.MaintenanceGroups',
+        'mg_policy':'admin.firmware.Policy',
+        'radius':'admin.Radius',
+        'remote_host':'admin.remoteHost',
+        'security':'admin.globalSecurity',
+        'smart_callhome':'admin.smartCallHome',
+        'smart_destinations':'admin.smartDestinations',
+        'smart_smtp_server':'admin.smartSmtpServer',
+        'syslog':'admin.Syslog',
+        'syslog_destinations':'admin.syslogRemoteDestinations',
+        'tacacs':'admin.Tacacs'
+    },
+    'fabric': {
+        'date_time':'fabric.DateandTime',
+        'dns_profile':'fabric.dnsProfiles',
+        'ntp':'fabric.Ntp',
+        'ntp_key':'fabric.NtpKeys',
+        'recommended_settings':'fabric.recommendedSettings',
+        'snmp_clgrp':'fabric.snmpClientGroups',
+        'snmp_community':'fabric.snmpCommunities',
+        'snmp_destinations':'fabric.snmpDestinations',
+        'snmp_policy':'fabric.snmpPolicy',
+        'snmp_user':'fabric.snmpUsers'
+    },
+    'site_policies': {
+        'group_id':'site.Groups',
+        'site_id':'site.Identifiers',
+        'site_settings':'easy_aci'
+    },
+    'switches': {
+        'intf_selector':'access.profiles.interfaceSelectors',
+        'port_cnvt':'access.switches.portConvert',
+        'sw_modules':'access.profiles.switchModules',
+        'switch':'access.profiles.switchProfiles'
+    },
+    'system_settings': {
+        'apic_preference':'system.apicConnectivityPreference',
+        'bgp_asn':'system.bgpASN',
+        'bgp_rr':'system.bgpRouteReflector',
+        'recommended_settings':'system.recommendedSettings'
+    },
+    'tenants': {
+        'apic_inb':'tenants.apic.InbandMgmt',
+        'app_add':'tenants.applicationProfiles',
+        'bd_add':'tenants.bridgeDomains',
+        'bd_template':'tenants.bd.Templates',
+        'bgp_pfx':'tenants.policies.bgpPrefix',
+        'bgp_template':'tenants.l3out.bgpPeerConnectivityProfile.Templates',
+        'contract_add':'tenants.contract.Contracts',
+        'contract_assign':'tenants.contract.ContractAssignments',
+        'contract_filters':'tenants.contract.ContractFilters',
+        'dhcp_relay':'tenants.policies.dhcpRelay',
+        'eigrp_interface':'tenants.policies.eigrpInterface',
+        'eigrp_profile':'tenants.l3out.eigrpInterfaceProfile',
+        'epg_add':'tenants.applicationEpgs',
+        'epg_template':'tenants.applicationEpg.Templates',
+        'epg_vmm_sites':'tenants.applicationEpg.VMMSites',
+        'epg_vmm_temp':'tenants.applicationEpg.VMMTemplates',
+        'ext_epg':'tenants.l3out.externalEpg',
+        'ext_epg_sub':'tenants.l3out.externalEpg.Subnet',
+        'ext_epg_temp':'tenants.l3out.externalEpg.Templates',
+        'filter_add':'tenants.contract.Filters',
+        'filter_entry':'tenants.contract.filterEntry',
+        'l3out_add':'tenants.L3Out',
+        'l3out_template':'tenants.L3Out.Templates',
+        'ndo_schema':'tenants.ndoSchemas',
+        'node_interface':'tenants.l3out.logicalNodeInterfaceProfile',
+        'node_intf_cfg':'tenants.l3out.logicalNodeInterfaceProfile.InterfaceConfiguration',
+        'node_intf_temp':'tenants.l3out.logicalNodeInterfaceProfile.Templates',
+        'node_profile':'tenants.l3out.logicalNodeProfile',
+        'ospf_interface':'tenants.policies.ospfInterface',
+        'ospf_profile':'tenants.l3out.ospfInterfaceProfile',
+        'ospf_routing':'tenants.l3out.ospfRoutingProfile',
+        'subnet_template':'tenants.bd.SubnetsTemplates',
+        'tenant_add':'tenants.Tenants',
+        'tenant_site':'tenants.Sites',
+        'vrf_add':'tenants.Vrfs',
+        'vrf_community':'tenants.vrf.Community',
+        'vrf_template':'tenants.vrf.Templates'
+    }
+}
+
+#======================================================
+# Worksheets checked by --validate-only with the
+# Handler Class and Function Keys each is read with.
+#======================================================
+validate_map = [
+    ('Sites', 'site_policies', sites_regex),
+    ('Access', 'access', access_regex),
+    ('Admin', 'admin', admin_regex),
+    ('Fabric', 'fabric', fabric_regex),
+    ('Switch Profiles', 'switches', switch_regex),
+    ('Switch Profiles', 'switches', port_convert_regex),
+    ('System Settings', 'system_settings', system_settings_regex),
+    ('Tenants', 'tenants', tenants_regex),
+    ('Virtual Networking', 'access', virtual_regex)
+]
+
 #=================================================================
 # Function to Read the Access Worksheet
 #=================================================================
@@ -73,6 +253,7 @@ def process_admin(args, easyDict, easy_jsonData, wb):
     class_folder = 'admin'
     func_regex = admin_regex
     ws = wb['Admin']
+    easyDict['remove_default_args'] = True
     easyDict = read_worksheet(args, class_init, class_folder, easyDict, easy_jsonData, func_regex, wb, ws)
     return easyDict
 
@@ -85,6 +266,7 @@ def process_fabric(args, easyDict, easy_jsonData, wb):
     class_folder = 'fabric'
     func_regex = fabric_regex
     ws = wb['Fabric']
+    easyDict['remove_default_args'] = True
     easyDict = read_worksheet(args, class_init, class_folder, easyDict, easy_jsonData, func_regex, wb, ws)
     return easyDict
 
@@ -100,6 +282,172 @@ def process_port_convert(args, easyDict, easy_jsonData, wb):
     easyDict = read_worksheet(args, class_init, class_folder, easyDict, easy_jsonData, func_regex, wb, ws)
     return easyDict
 
+#=================================================================
+# Function to Fingerprint the Worksheets used by a Process
+#=================================================================
+def process_fingerprint(process, easyDict, wb):
+    ws_data = [worksheet_rows(wb, ws) for ws in process_map[process]['worksheets']]
+    if process_map[process].get('site_workbooks'):
+        # The Switch Profiles are also read from the Interface Selector Workbooks
+        for k, v in easyDict['sites'].items():
+            site_wb = '%s_interface_selectors.xlsx' % (v['site_settings']['site_name'])
+            if os.path.isfile(site_wb):
+                ws_data.append(easy_functions.file_sha256(site_wb))
+    return easy_functions.fingerprint(ws_data)
+
+#=================================================================
+# Function to Restore the Processes with Unchanged Worksheets
+#=================================================================
+def process_incremental(args, easyDict, jsonFile, process_list, wb):
+    state = easy_functions.incremental_load(args.dir)
+    global_hash = easy_functions.fingerprint([easy_functions.file_sha256(jsonFile), worksheet_rows(wb, 'Sites')])
+    full_run = not state['global'] == global_hash
+    easyDict['incremental'] = {
+        'full_run':full_run, 'global':global_hash, 'snapshots':{}, 'state':state, 'yaml':{}
+    }
+    partials = {}
+    for x in process_list:
+        snapshot = state['snapshots'].get(x)
+        if full_run == True or snapshot == None: continue
+        if not state['processes'].get(x) == process_fingerprint(x, easyDict, wb): continue
+        if any([not i in partials for i in process_map[x]['depends']]): continue
+
+        # Sensitive Variables are only prompted for by the Handlers
+        rerun = False
+        for site, sensitive_vars in pickle.loads(snapshot)['sensitive_vars'].items():
+            siteDict = easyDict['sites'][site]['site_settings']
+            if siteDict['run_location'] == 'local' or siteDict['configure_terraform_cloud'] == 'true':
+                for i in sensitive_vars:
+                    if os.environ.get(f'TF_VAR_{i}') is None: rerun = True
+        if rerun == False:
+            for ws in process_map[x]['worksheets']:
+                print(f'   Worksheet "{ws}" is unchanged.  Using the results from the last run.')
+            partials[x] = snapshot
+    return easyDict, partials
+
+#=================================================================
+# Function to Merge the Results of a Process into the easyDict
+#=================================================================
+def process_merge(process, easyDict, partial):
+    partial = pickle.loads(partial)
+    for k, v in partial['sites'].items():
+        easyDict['sites'][k].update(v)
+        easyDict['sites'][k]['sensitive_vars'].extend(partial['sensitive_vars'][k])
+    if process_map[process].get('tmp'):
+        easyDict['tmp'] = partial['tmp']
+    return easyDict
+
+#=================================================================
+# Function to Evaluate Processes in Parallel
+#=================================================================
+def process_parallel(args, easyDict, easy_jsonData, process_list, wb, partials):
+    # Read the Worksheets once here instead of in every worker
+    for x in process_list:
+        for ws in process_map[x]['worksheets']:
+            wb[ws]
+    base_dict = pickle.dumps(easyDict, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def worker_dict(process):
+        worker_easyDict = pickle.loads(base_dict)
+        for i in process_map[process]['depends']:
+            if i in partials: worker_easyDict = process_merge(i, worker_easyDict, partials[i])
+        return worker_easyDict
+
+    futures = {}
+    outputs = {}
+    serial_list = []
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        while len(futures) > 0 or len([x for x in process_list if not x in outputs]) > 0:
+            for x in process_list:
+                if x in outputs or x in futures.values(): continue
+                if any([i in serial_list for i in process_map[x]['depends']]):
+                    serial_list.append(x)
+                    outputs[x] = ''
+                elif all([i in outputs or not i in process_list for i in process_map[x]['depends']]):
+                    future = executor.submit(process_worker, args, x, worker_dict(x), easy_jsonData, wb)
+                    futures[future] = x
+            done, pending = wait(futures.keys(), return_when=FIRST_COMPLETED)
+            for future in done:
+                x = futures.pop(future)
+                result = future.result()
+                outputs[x] = result['output']
+                if result['status'] == 'exit':
+                    print(result['output'])
+                    exit()
+                elif result['status'] == 'input':
+                    serial_list.append(x)
+                    outputs[x] = ''
+                else:
+                    partials[x] = result['partial']
+                    validating.memo_merge(result['memo_stats'])
+
+    # Print the Worksheet Logs in Process Order
+    for x in process_list:
+        print(outputs[x], end = '')
+        if x in serial_list:
+            # Processes that need to prompt for Sensitive Variables run here
+            worker_easyDict = worker_dict(x)
+            sensitive_count = {}
+            for k, v in worker_easyDict['sites'].items():
+                sensitive_count[k] = len(v['sensitive_vars'])
+            worker_easyDict = process_functions[x](args, worker_easyDict, easy_jsonData, wb)
+            partials[x] = process_partial(x, worker_easyDict, sensitive_count)
+    return partials
+
+#=================================================================
+# Function to Capture the Results of a Process
+#=================================================================
+def process_partial(process, easyDict, sensitive_count):
+    partial = {'sensitive_vars':{}, 'sites':{}, 'tmp':None}
+    for k, v in easyDict['sites'].items():
+        partial['sensitive_vars'][k] = v['sensitive_vars'][sensitive_count[k]:]
+        partial['sites'][k] = {}
+        for i in process_map[process]['site_keys']:
+            if i in v: partial['sites'][k][i] = v[i]
+    if process_map[process].get('tmp'):
+        partial['tmp'] = easyDict['tmp']
+    return pickle.dumps(partial, protocol=pickle.HIGHEST_PROTOCOL)
+
+#=================================================================
+# Function to Run the Processes of the Workbook
+#=================================================================
+def process_run(args, easyDict, easy_jsonData, process_list, wb, partials):
+    if args.jobs > 1:
+        run_list = [x for x in process_list if not x in partials]
+        partials = process_parallel(args, easyDict, easy_jsonData, run_list, wb, partials)
+        for x in process_list:
+            easyDict = process_merge(x, easyDict, partials[x])
+        return easyDict, partials
+
+    for x in process_list:
+        if x in partials:
+            easyDict = process_merge(x, easyDict, partials[x])
+        else:
+            sensitive_count = {}
+            for k, v in easyDict['sites'].items():
+                sensitive_count[k] = len(v['sensitive_vars'])
+            easyDict = process_functions[x](args, easyDict, easy_jsonData, wb)
+            if args.incremental == True:
+                partials[x] = process_partial(x, easyDict, sensitive_count)
+    return easyDict, partials
+
+#=================================================================
+# Function to Save the Incremental State and find Changed Sites
+#=================================================================
+def process_incremental_save(args, easyDict, wb):
+    # Which Sites changed is left to the generated file Manifest
+    incremental = easyDict['incremental']
+    state = {
+        'format':incremental['state']['format'],
+        'global':incremental['global'],
+        'processes':{},
+        'snapshots':incremental['snapshots'],
+        'yaml':incremental['yaml']
+    }
+    for x in incremental['snapshots'].keys():
+        state['processes'][x] = process_fingerprint(x, easyDict, wb)
+    easy_functions.incremental_save(args.dir, state)
+
 #=================================================================
 # Function to Setup Terraform Run Location
 #=================================================================
@@ -152,6 +500,7 @@ def process_system_settings(args, easyDict, easy_jsonData, wb):
     class_folder = 'system_settings'
     func_regex = system_settings_regex
     ws = wb['System Settings']
+    easyDict['remove_default_args'] = True
     easyDict = read_worksheet(args, class_init, class_folder, easyDict, easy_jsonData, func_regex, wb, ws)
     return easyDict
 
@@ -204,27 +553,60 @@ def process_virtual_networking(args, easyDict, easy_jsonData, wb):
     class_folder = 'access'
     func_regex = virtual_regex
     ws = wb['Virtual Networking']
+    easyDict['remove_default_args'] = True
     easyDict = read_worksheet(args, class_init, class_folder, easyDict, easy_jsonData, func_regex, wb, ws)
     return easyDict
 
+#=================================================================
+# Function to Evaluate a Process in a Worker Process
+#=================================================================
+def process_worker(args, process, easyDict, easy_jsonData, wb):
+    sensitive_count = {}
+    for k, v in easyDict['sites'].items():
+        sensitive_count[k] = len(v['sensitive_vars'])
+    memo_stats = validating.memo_stats()
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            easyDict = process_functions[process](args, easyDict, easy_jsonData, wb)
+            # The Site Group rows still queued are applied here
+            partial = process_partial(process, easyDict, sensitive_count)
+    except EOFError:
+        # The Worker has no stdin to prompt for Sensitive Variables
+        return {'output':output.getvalue(), 'partial':None, 'status':'input'}
+    except SystemExit:
+        return {'output':output.getvalue(), 'partial':None, 'status':'exit'}
+    return {
+        'memo_stats':validating.memo_stats(since=memo_stats),
+        'output':output.getvalue(),
+        'partial':partial,
+        'status':'ok'
+    }
+
+#=================================================================
+# Function to get the Rows of a Worksheet for Fingerprinting
+#=================================================================
+def worksheet_rows(wb, ws):
+    # Trailing empty rows come and go when the workbook is saved
+    rows = list(wb[ws].rows)
+    while rows and not any(rows[-1]): rows.pop()
+    return rows
+
 #=================================================================
 # Function to process the Worksheets and Create Terraform Files
 #=================================================================
 def read_worksheet(args, class_init, class_folder, easyDict, easy_jsonData, func_regex, wb, ws):
-    rows = ws.max_row
-    func_list = easy_functions.findKeys(ws, func_regex)
+    ws_index = easy_functions.index_worksheet(ws, func_regex)
     easy_functions.stdout_log(ws, None, 'begin')
-    for func in func_list:
-        count = easy_functions.countKeys(ws, func)
-        var_dict = easy_functions.findVars(ws, func, rows, count)
-        for pos in var_dict:
-            row_num = var_dict[pos]['row']
-            del var_dict[pos]['row']
-            for x in list(var_dict[pos].keys()):
-                if var_dict[pos][x] == '':
-                    del var_dict[pos][x]
+    for func in ws_index:
+        columns = ws_index[func]['columns']
+        for row_num, values in ws_index[func]['rows']:
+            var_dict = dict(zip(columns, values))
+            for x in list(var_dict.keys()):
+                if var_dict[x] == '':
+                    del var_dict[x]
             easy_functions.stdout_log(ws, row_num, 'begin')
-            var_dict[pos].update(
+            var_dict.update(
                 {
                     'args':args,
                     'class_folder':class_folder,
@@ -235,25 +617,219 @@ def read_worksheet(args, class_init, class_folder, easyDict, easy_jsonData, func
                     'ws':ws
                 }
             )
-            easyDict = eval(f"classes.{class_init}(class_folder).{func}(**var_dict[pos])")
+            easyDict = load_handlers()[class_init][func](**var_dict)
     
     easy_functions.stdout_log(ws, None, 'end')
     # Return the easyDict
     return easyDict
 
+#=================================================================
+# Function to Load the Worksheet Handlers
+#=================================================================
+def load_handlers():
+    # The Handlers are built on first use, in each Process that needs them,
+    # so importing this module has no side effects.
+    # The Function Keys of a Class are its public methods
+    if len(handlers) > 0: return handlers
+    for class_init, class_folder in handler_classes:
+        handler = getattr(classes, class_init)(class_folder)
+        handlers[class_init] = {}
+        for func in dir(handler):
+            if not func.startswith('_') and callable(getattr(handler, func)):
+                handlers[class_init][func] = getattr(handler, func)
+    return handlers
+
+#=================================================================
+# Function to Validate the Workbook and Report every Error
+#=================================================================
+def validate_workbook(args, easy_jsonData, wb):
+    errors = []
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            futures = [executor.submit(validate_worksheet, args, easy_jsonData, wb, *x) for x in validate_map]
+            for future in futures:
+                errors.extend(future.result())
+    else:
+        for x in validate_map:
+            errors.extend(validate_worksheet(args, easy_jsonData, wb, *x))
+
+    # Sort by Worksheet Order, Row and Column
+    sheet_order = [x[0] for x in validate_map]
+    errors.sort(key=lambda e: (
+        sheet_order.index(e['worksheet']), e['row'], len(e['column'] or ''), e['column'] or '', e['key']
+    ))
+    print(f'\n-----------------------------------------------------------------------------\n')
+    if len(errors) == 0:
+        print(f'   Validation Complete.  No Errors were found in {args.workbook}.')
+    else:
+        print(f'   Validation found {len(errors)} Error(s) in {args.workbook}:\n')
+        for e in errors:
+            if e['column']: cell = f'Column {e["column"]} ({e["key"]})'
+            else: cell = e['key']
+            print(f'   - Worksheet "{e["worksheet"]}", Row {e["row"]}, {cell}: {e["message"]}')
+    print(f'\n-----------------------------------------------------------------------------\n')
+    if args.validate_report:
+        with open(args.validate_report, 'w') as fh:
+            json.dump(errors, fh, indent=4)
+        print(f'   Validation Report written to {args.validate_report}.')
+        print(f'\n-----------------------------------------------------------------------------\n')
+    return errors
+
+#=================================================================
+# Function to Validate the Rows of a Worksheet
+#=================================================================
+def validate_worksheet(args, easy_jsonData, wb, worksheet, class_init, func_regex):
+    # The Handlers run up to process_kwargs, which collects the Errors of the Row
+    # and stops them before anything is added to the easyDict or written.
+    easyDict = {
+        'remove_default_args':True, 'site_groups':{}, 'sites':{}, 'tmp':{}, 'validate_only':True
+    }
+    errors = []
+    try:
+        ws = wb[worksheet]
+    except KeyError:
+        return [{
+            'column':None, 'function':None, 'key':'', 'message':'The Worksheet was not found in the Workbook.',
+            'row':0, 'worksheet':worksheet
+        }]
+    class_folder = dict(handler_classes)[class_init]
+    ws_index = easy_functions.index_worksheet(ws, func_regex)
+    for func in ws_index:
+        if not handler_schemas[class_init].get(func): continue
+        jsonData = easy_jsonData[handler_schemas[class_init][func]]['allOf'][1]['properties']
+        columns = ws_index[func]['columns']
+        for row_num, values in ws_index[func]['rows']:
+            var_dict = dict(zip(columns, values))
+            for x in list(var_dict.keys()):
+                if var_dict[x] == '':
+                    del var_dict[x]
+            row_dict = dict(var_dict)
+            var_dict.update(
+                {
+                    'args':args,
+                    'class_folder':class_folder,
+                    'easyDict':easyDict,
+                    'easy_jsonData':easy_jsonData,
+                    'row_num':row_num,
+                    'wb':wb,
+                    'ws':ws
+                }
+            )
+            # Handlers add Arguments for some values; put the Schema back after
+            required_args = dict(jsonData['required_args'])
+            optional_args = dict(jsonData['optional_args'])
+            output = io.StringIO()
+            try:
+                with redirect_stdout(output):
+                    load_handlers()[class_init][func](**var_dict)
+                row_errors = []
+            except easy_functions.ValidationComplete as e:
+                row_errors = e.errors
+            except SystemExit:
+                row_errors = [('', easy_functions.validate_message(output.getvalue()))]
+            except Exception:
+                # The Handler needs the easyDict of a full run, check the Row on its own
+                row_dict.update({'easyDict':easyDict, 'easy_jsonData':easy_jsonData, 'row_num':row_num, 'ws':ws})
+                row_errors = easy_functions.validate_errors(jsonData, **row_dict)
+            finally:
+                jsonData['required_args'] = required_args
+                jsonData['optional_args'] = optional_args
+            for key, message in row_errors:
+                column = ws_index[func]['letters'].get(key)
+                errors.append({
+                    'column':column, 'function':func, 'key':key, 'message':message,
+                    'row':row_num, 'worksheet':worksheet
+                })
+    return errors
+
+#=================================================================
+# Function to Print the Hit Rates of the memoized Validators
+#=================================================================
+def validator_stats():
+    print(f'\n-----------------------------------------------------------------------------\n')
+    print(f'   Memoized Validator Hit Rates:\n')
+    for k, v in validating.memo_stats().items():
+        total = v['hits'] + v['misses']
+        if total > 0: rate = 100 * v['hits'] / total
+        else: rate = 0
+        print(f'   - {k}: {v["hits"]} hits, {v["misses"]} misses ({rate:.1f}%)')
+    print(f'\n-----------------------------------------------------------------------------\n')
+
+#======================================================
+# Worksheet Handlers, filled by load_handlers on first
+# use, and the Process Functions.
+#======================================================
+handlers = {}
+process_functions = {
+    'access': process_access,
+    'admin': process_admin,
+    'fabric': process_fabric,
+    'port_convert': process_port_convert,
+    'sites': process_sites,
+    'switches': process_switches,
+    'system_settings': process_system_settings,
+    'tenants': process_tenants,
+    'virtual_networking': process_virtual_networking
+}
+
 #=================================================================
 # The Main Module
 #=================================================================
 def main():
     Parser = argparse.ArgumentParser(description='IaC Easy ACI Deployment Module')
+    Parser.add_argument('-cd', '--cache-dir',
+        default = os.path.join(os.path.expanduser('~'), '.easy_aci', 'cache'),
+        help = 'The Directory to use for the parsed Workbook cache.'
+    )
+    Parser.add_argument('-cs', '--cache-size',
+        default = 64, type = int,
+        help = 'Maximum size of the parsed Workbook cache in MB.  0 disables the cache.'
+    )
     Parser.add_argument('-d', '--dir',
         default = 'ACI',
         help = 'The Directory to use for the Creation of the Terraform Files.'
     )
+    Parser.add_argument('-j', '--jobs',
+        default = None, type = int,
+        help = 'Number of worker processes used to evaluate the independent Worksheets.  '\
+            'Defaults to 1, or to the CPU count with --validate-only.'
+    )
+    Parser.add_argument('-gs', '--git-status', action='store_true',
+        help = 'Also treat the Sites with uncommitted files in git as changed, on top of the generated file Manifest.'
+    )
+    Parser.add_argument('-i', '--incremental', action='store_true',
+        help = 'Only process the Worksheets and write the files that changed since the last run.'
+    )
+    Parser.add_argument('-lf', '--list-functions', action='store_true',
+        help = 'List the Function Keys each Worksheet Handler Class accepts and Exit.'
+    )
+    Parser.add_argument('-mr', '--modules-ref',
+        default = None,
+        help = 'The easy-aci-complete branch, tag or commit to pin the Terraform Modules to.  '\
+            'Defaults to the last pin, or the default branch the first time.'
+    )
+    Parser.add_argument('-rm', '--refresh-modules', action='store_true',
+        help = 'Fetch the Terraform Modules again, even when the pin did not change.'
+    )
     Parser.add_argument(
         '-s', '--skip-version-check', action='store_true',
         help = 'Flag to Skip the APIC and NDO Version Check.'
     )
+    Parser.add_argument('-tj', '--terraform-jobs',
+        default = 4, type = int,
+        help = 'Number of Sites to run terraform init, plan and apply for at the same time.'
+    )
+    Parser.add_argument('-vs', '--validator-stats', action='store_true',
+        help = 'Print the Hit Rates of the memoized Validators once the Worksheets are evaluated.'
+    )
+    Parser.add_argument('-vo', '--validate-only', action='store_true',
+        help = 'Validate every Row of the Workbook, Report all the Errors found and Exit.  '\
+            'The Controllers, git and Terraform are not touched.'
+    )
+    Parser.add_argument('-vr', '--validate-report',
+        default = None,
+        help = 'With --validate-only, also write the Validation Errors to this JSON file.'
+    )
     Parser.add_argument('-wb', '--workbook',
         default = 'ACI_Base_Workbookv3.xlsx',
         help = 'The source Workbook.'
@@ -276,6 +852,19 @@ def main():
             12. virtual_networking: for Virtual Networking'
     )
     args = Parser.parse_args()
+    if args.jobs == None:
+        if args.validate_only == True: args.jobs = os.cpu_count()
+        else: args.jobs = 1
+
+    # List the Worksheet Handler Functions
+    if args.list_functions == True:
+        print(f'\n-----------------------------------------------------------------------------\n')
+        for class_init, class_folder in handler_classes:
+            print(f'   {class_init}:')
+            for func in load_handlers()[class_init].keys():
+                print(f'     - {func}')
+        print(f'\n-----------------------------------------------------------------------------\n')
+        exit()
 
     # Determine the Operating System
     opSystem = platform.system()
@@ -286,9 +875,7 @@ def main():
     else: path_sep = '/'
 
     jsonFile = f'{script_path}{path_sep}templates{path_sep}variables{path_sep}easy_variables.json'
-    jsonOpen = open(jsonFile, 'r')
-    easy_jsonData = json.load(jsonOpen)
-    jsonOpen.close()
+    easy_jsonData = easy_functions.schema_bundle(jsonFile)
 
     destdirCheck = False
     while destdirCheck == False:
@@ -325,10 +912,17 @@ def main():
                 print('\nWorkbook not Found.  Please enter a valid /path/filename for the source you will be using.')
 
     # Load Workbook
-    wb = easy_functions.read_in(excel_workbook)
+    args.workbook = excel_workbook
+    wb = easy_functions.workbook_cache(excel_workbook, args.cache_dir, args.cache_size)
+
+    # Only Validate the Workbook if specified in args
+    if args.validate_only == True:
+        errors = validate_workbook(args, easy_jsonData, wb)
+        wb.close()
+        if len(errors) > 0: sys.exit(1)
+        exit()
 
     # Create Dictionary for Worksheets in the Workbook
-    easy_jsonData = easy_jsonData['components']['schemas']
     easyDict = {}
     easyDict['latest_versions'] = easy_jsonData['easy_aci']['allOf'][1]['properties']['latest_versions']
 
@@ -349,9 +943,8 @@ def main():
         r1 = 'access|admin|bridge_domains|contracts|epgs|fabric|inventory'
         r2 = 'l3out|port_convert|sites|switch|system_settings|tenants'
         ws_regex = f'^({r1}|{r2})$'
-        if re.search(ws_regex, str(args.worksheet)):
-            process_type = f'process_{args.worksheet}'
-            eval(f"{process_type}(args, easyDict, easy_jsonData, wb)")
+        if re.search(ws_regex, str(args.worksheet)) and args.worksheet in process_functions:
+            process_functions[args.worksheet](args, easyDict, easy_jsonData, wb)
         else:
             print(f'\n-----------------------------------------------------------------------------\n')
             print(f'   ERROR: "{args.worksheet}" is not a valid worksheet.  If you are trying ')
@@ -361,16 +954,25 @@ def main():
             exit()
     else:
         process_list = easy_jsonData['easy_aci']['allOf'][1]['properties']['processes']['enum']
-        for x in process_list:
-            process_type = f'process_{x}'
-            easyDict = eval(f"{process_type}(args, easyDict, easy_jsonData, wb)")
+        partials = {}
+        if args.incremental == True:
+            easyDict, partials = process_incremental(args, easyDict, jsonFile, process_list, wb)
+        easyDict, partials = process_run(args, easyDict, easy_jsonData, process_list, wb, partials)
+        if args.incremental == True:
+            easyDict['incremental']['snapshots'] = partials
+    if args.validator_stats == True:
+        validator_stats()
 
     # Begin Proceedures to Create files
+    easy_functions.manifest_load(args.dir)
     easy_functions.create_yaml(args, easy_jsonData, **easyDict)
     site_names, site_directories = easy_functions.merge_easy_aci_repository(args, easy_jsonData, **easyDict)
     easyDict = process_site_settings(args, easyDict, easy_jsonData, wb)
+    easy_functions.terraform_fmt(args)
+    easy_functions.write_report()
+    if easyDict.get('incremental'): process_incremental_save(args, easyDict, wb)
+    wb.close()
     args, changed_folders, gitFolder = easy_functions.git_check_status(args, site_names, site_directories)
-    if gitFolder == False: changed_folders = site_directories
     easyDict['changed_folders'] = changed_folders
     easyDict['site_names'] = site_names
     easy_functions.apply_terraform(args, path_sep, **easyDict)
@@ -1,11 +1,155 @@
 #!/usr/bin/env python3
 
+from functools import lru_cache
 import ipaddress
 import json
 import phonenumbers
 import re
 import validators
 
+# Compiled Schema
+class schema_property(dict):
+    # The Property stays a dict for the Handlers; the Validation Rules are
+    # read from the JSON once and kept as attributes.
+    def __init__(self, prop):
+        dict.__init__(self, prop)
+        self.type = prop.get('type')
+        self.default = prop.get('default')
+        self.minimum = int(prop['minimum']) if 'minimum' in prop else None
+        self.maximum = int(prop['maximum']) if 'maximum' in prop else None
+        self.enum = frozenset(prop.get('enum', []))
+        self.enum_str = frozenset([str(x) for x in prop.get('enum', [])])
+        self.patterns = {}
+
+    def compiled(self, key='pattern'):
+        # Compile on first use, not every pattern in the schema is valid
+        if not key in self.patterns:
+            self.patterns[key] = re.compile(self[key])
+        return self.patterns[key]
+
+class schema_properties(dict):
+    # The Properties of a Schema, with the Validation Plans built for it
+    def __init__(self, properties):
+        dict.__init__(self, properties)
+        self.plans = {}
+
+    def __getstate__(self):
+        # Plans hold closures and are rebuilt where the Schema is loaded
+        return {'plans':{}}
+
+def compile_schema(jsonData):
+    for schema in jsonData['components']['schemas'].values():
+        properties = schema_properties(schema['allOf'][1]['properties'])
+        for k, v in properties.items():
+            if type(v) == dict and 'type' in v:
+                properties[k] = schema_property(v)
+        schema['allOf'][1]['properties'] = properties
+    return jsonData
+
+def schema_rules(var, jsonData):
+    if isinstance(jsonData[var], schema_property):
+        return jsonData[var]
+    return schema_property(jsonData[var])
+
+# Memoized Checks
+# Workbooks repeat the same values many times.  The result of each check
+# only depends on the value, so it is kept in a bounded LRU cache per check.
+memo_size = 4096
+
+@lru_cache(maxsize=memo_size)
+def check_dns_name(hostname):
+    valid_count = 0
+    if len(hostname) > 255:
+        valid_count =+ 1
+    if hostname[-1] == ".":
+        hostname = hostname[:-1] # strip exactly one dot from the right, if present
+    allowed = re.compile("(?!-)[A-Z\d-]{1,63}(?<!-)$", re.IGNORECASE)
+    if not all(allowed.match(x) for x in hostname.split(".")):
+        valid_count =+ 1
+    return valid_count == 0
+
+@lru_cache(maxsize=memo_size)
+def check_domain(value):
+    return bool(validators.domain(value))
+
+@lru_cache(maxsize=memo_size)
+def check_email(value):
+    return bool(validators.email(value, whitelist=None))
+
+@lru_cache(maxsize=memo_size)
+def check_ip_address(value):
+    if re.search('/', value):
+        x = value.split('/')
+        address = x[0]
+    else:
+        address = value
+    valid_count = 0
+    if re.search(r'\.', address):
+        if not validators.ip_address.ipv4(address):
+            valid_count =+ 1
+    else:
+        if not validators.ip_address.ipv6(address):
+            valid_count =+ 1
+    return valid_count == 0
+
+@lru_cache(maxsize=memo_size)
+def check_phone_number(value):
+    # Only the flag and the printed form are cached, never the PhoneNumber itself
+    phone_number = phonenumbers.parse(value, None)
+    return phonenumbers.is_possible_number(phone_number), str(phone_number)
+
+@lru_cache(maxsize=memo_size)
+def check_vlans(value):
+    # Returns the first VLAN that is not valid
+    if re.search(',', str(value)):
+        vlan_split = value.split(',')
+        for x in vlan_split:
+            if re.search('\\-', x):
+                dash_split = x.split('-')
+                for z in dash_split:
+                    if not validators.between(int(z), min=1, max=4095):
+                        return z
+            elif not validators.between(int(x), min=1, max=4095):
+                return x
+    elif re.search('\\-', str(value)):
+        dash_split = value.split('-')
+        for x in dash_split:
+            if not validators.between(int(x), min=1, max=4095):
+                return x
+    elif not validators.between(int(value), min=1, max=4095):
+        return value
+    return None
+
+memo_checks = {
+    'dns_name':check_dns_name,
+    'domain':check_domain,
+    'email':check_email,
+    'ip_address':check_ip_address,
+    'phone_number':check_phone_number,
+    'vlans':check_vlans
+}
+# Counters of the Worker Processes
+memo_merged = dict((k, {'hits':0, 'misses':0}) for k in memo_checks.keys())
+
+def memo_merge(stats):
+    for k, v in stats.items():
+        memo_merged[k]['hits'] += v['hits']
+        memo_merged[k]['misses'] += v['misses']
+
+def memo_stats(since=None):
+    stats = {}
+    for k, check in memo_checks.items():
+        info = check.cache_info()
+        stats[k] = {
+            'hits':info.hits + memo_merged[k]['hits'],
+            'misses':info.misses + memo_merged[k]['misses'],
+            'size':info.currsize
+        }
+        if since:
+            stats[k]['hits'] -= since[k]['hits']
+            stats[k]['misses'] -= since[k]['misses']
+    return stats
+
 # Error Messages
 def error_bundle_names(var, **kwargs):
     varValue = kwargs[var]
@@ -222,7 +366,7 @@ def domain(var, **kwargs):
     row_num = kwargs['row_num']
     ws = kwargs['ws']
     varValue = kwargs[var]
-    if not validators.domain(varValue):
+    if not check_domain(varValue):
         print(f'\n-----------------------------------------------------------------------------\n')
         print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}. Domain {varValue}')
         print(f'   is invalid.  Please Validate the domain and retry.  Exiting....')
@@ -233,16 +377,7 @@ def dns_name(var, **kwargs):
     row_num = kwargs['row_num']
     ws = kwargs['ws']
     varValue = kwargs[var]
-    hostname = varValue
-    valid_count = 0
-    if len(hostname) > 255:
-        valid_count =+ 1
-    if hostname[-1] == ".":
-        hostname = hostname[:-1] # strip exactly one dot from the right, if present
-    allowed = re.compile("(?!-)[A-Z\d-]{1,63}(?<!-)$", re.IGNORECASE)
-    if not all(allowed.match(x) for x in hostname.split(".")):
-        valid_count =+ 1
-    if not valid_count == 0:
+    if not check_dns_name(varValue):
         print(f'\n--------------------------------------------------------------------------------\n')
         print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}, {varValue} ')
         print(f'   is not a valid Hostname.  Confirm that you have entered the DNS Name Correctly.')
@@ -254,7 +389,7 @@ def email(var, **kwargs):
     row_num = kwargs['row_num']
     ws = kwargs['ws']
     varValue = kwargs[var]
-    if not validators.email(varValue, whitelist=None):
+    if not check_email(varValue):
         print(f'\n-----------------------------------------------------------------------------\n')
         print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}. Email address "{varValue}"')
         print(f'   is invalid.  Please Validate the email and retry.  Exiting....')
@@ -306,19 +441,7 @@ def ip_address(var, **kwargs):
     row_num = kwargs['row_num']
     ws = kwargs['ws']
     varValue = kwargs[var]
-    if re.search('/', varValue):
-        x = varValue.split('/')
-        address = x[0]
-    else:
-        address = varValue
-    valid_count = 0
-    if re.search(r'\.', address):
-        if not validators.ip_address.ipv4(address):
-            valid_count =+ 1
-    else:
-        if not validators.ip_address.ipv6(address):
-            valid_count =+ 1
-    if not valid_count == 0:
+    if not check_ip_address(varValue):
         print(f'\n-----------------------------------------------------------------------------\n')
         print(f'   Error on Worksheet {ws.title} Row {row_num}. {var} {varValue} is not ')
         print(f'   a valid IPv4 or IPv6 Address.  Exiting....')
@@ -327,19 +450,20 @@ def ip_address(var, **kwargs):
 
 def key_value(var, jsonData, **kwargs):
     # Get Variables from Library
-    key_min       = jsonData[var]['key_minimum']
-    key_max       = jsonData[var]['key_maximum']
-    key_pattern   = jsonData[var]['key_pattern']
-    value_min     = jsonData[var]['value_minimum']
-    value_max     = jsonData[var]['value_maximum']
-    value_pattern = jsonData[var]['value_pattern']
+    rules = schema_rules(var, jsonData)
+    key_min       = int(rules['key_minimum'])
+    key_max       = int(rules['key_maximum'])
+    key_pattern   = rules['key_pattern']
+    value_min     = int(rules['value_minimum'])
+    value_max     = int(rules['value_maximum'])
+    value_pattern = rules['value_pattern']
     row_num = kwargs['row_num']
     varList = kwargs[var]
     ws = kwargs['ws']
     for val in varList.split(','):
         for key_val in val.split(':'):
-            if not (re.fullmatch(key_pattern,  key_val[0]) and validators.length(
-                str(key_val[0]), min=int(key_min), max=int(key_max))):
+            if not (rules.compiled('key_pattern').fullmatch(key_val[0]) and \
+                key_min <= len(str(key_val[0])) <= key_max):
                 print(f'\n-----------------------------------------------------------------------------\n')
                 print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}. ')
                 print(f'   "{key_val[0]}" is an invalid Value...')
@@ -350,8 +474,8 @@ def key_value(var, jsonData, **kwargs):
                 print(f'    Exiting....')
                 print(f'\n-----------------------------------------------------------------------------\n')
                 exit()
-            if not (re.fullmatch(re.fullmatch(value_pattern,  key_val[1])) and \
-                validators.length(str(key_val[1]), min=int(value_min), max=int(value_max))):
+            if not (rules.compiled('value_pattern').fullmatch(key_val[1]) and \
+                value_min <= len(str(key_val[1])) <= value_max):
                 print(f'\n-----------------------------------------------------------------------------\n')
                 print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}. ')
                 print(f'   "{key_val[1]}" is an invalid Value...')
@@ -410,13 +534,10 @@ def length_and_regex_sensitive(pattern, varName, varValue, minimum, maximum):
 def list_values(var, jsonData, **kwargs):
     row_num = kwargs['row_num']
     ws = kwargs['ws']
-    varList = jsonData[var]['enum']
+    rules = schema_rules(var, jsonData)
+    varList = rules['enum']
     varValue = kwargs[var]
-    match_count = 0
-    for x in varList:
-        if str(x) == str(varValue):
-            match_count =+ 1
-    if not match_count > 0:
+    if not str(varValue) in rules.enum_str:
         print(f'\n-----------------------------------------------------------------------------\n')
         print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}, {varValue}. ')
         print(f'   {var} should be one of the following:')
@@ -429,13 +550,10 @@ def list_values(var, jsonData, **kwargs):
 def list_values_key(dictkey, var, jsonData, **kwargs):
     row_num = kwargs['row_num']
     ws = kwargs['ws']
-    varList = jsonData[dictkey]['enum']
+    rules = schema_rules(dictkey, jsonData)
+    varList = rules['enum']
     varValue = kwargs[var]
-    match_count = 0
-    for x in varList:
-        if x == varValue:
-            match_count =+ 1
-    if not match_count > 0:
+    if not varValue in rules.enum:
         print(f'\n-----------------------------------------------------------------------------\n')
         print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}, {varValue}. ')
         print(f'   {var} should be one of the following:')
@@ -488,12 +606,13 @@ def mgmt_network(row_num, ws, var1, var1_value, var2, var2_value):
         exit()
 
 def number_check(var, jsonData, **kwargs):
-    minimum = jsonData[var]['minimum']
-    maximum = jsonData[var]['maximum']
+    rules = schema_rules(var, jsonData)
+    minimum = rules.minimum
+    maximum = rules.maximum
     row_num = kwargs['row_num']
     ws = kwargs['ws']
     varValue = kwargs[var]
-    if not (validators.between(int(varValue), min=int(minimum), max=int(maximum))):
+    if not minimum <= int(varValue) <= maximum:
         print(f'\n-----------------------------------------------------------------------------\n')
         print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}, {varValue}. Valid Values ')
         print(f'   are between {minimum} and {maximum}.  Exiting....')
@@ -501,21 +620,15 @@ def number_check(var, jsonData, **kwargs):
         exit()
 
 def number_list(var, jsonData, **kwargs):
-    minimum = jsonData[var]['minimum']
-    maximum = jsonData[var]['maximum']
+    rules = schema_rules(var, jsonData)
+    minimum = rules.minimum
+    maximum = rules.maximum
     row_num = kwargs['row_num']
     ws = kwargs['ws']
     varValue = kwargs[var]
-    if '-' in str(varValue):
-        varValue = varValue.split('-')
-        if ',' in str(varValue):
-            varValue = varValue.split(',')
-    elif ',' in str(varValue):
-        varValue = varValue.split(',')
-    else:
-        varValue = [varValue]
+    varValue = re.split('[,-]', str(varValue))
     for x in varValue:
-        if not (validators.between(int(x), min=int(minimum), max=int(maximum))):
+        if not minimum <= int(x) <= maximum:
             print(f'\n-----------------------------------------------------------------------------\n')
             print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}, {x}. Valid Values ')
             print(f'   are between {minimum} and {maximum}.  Exiting....')
@@ -537,8 +650,8 @@ def phone_number(var, **kwargs):
     row_num = kwargs['row_num']
     ws = kwargs['ws']
     varValue = kwargs[var]
-    phone_number = phonenumbers.parse(varValue, None)
-    if not phonenumbers.is_possible_number(phone_number):
+    valid, phone_number = check_phone_number(varValue)
+    if not valid:
         print(f'\n-----------------------------------------------------------------------------\n')
         print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}. Phone Number "{phone_number}" ')
         print(f'   is invalid.  Make sure you are including the country code and the full phone number.')
@@ -548,15 +661,15 @@ def phone_number(var, **kwargs):
 
 def string_list(var, jsonData, **kwargs):
     # Get Variables from Library
-    minimum = jsonData[var]['minimum']
-    maximum = jsonData[var]['maximum']
-    pattern = jsonData[var]['pattern']
+    rules = schema_rules(var, jsonData)
+    minimum = rules.minimum
+    maximum = rules.maximum
+    pattern = rules['pattern']
     row_num = kwargs['row_num']
     varValues = kwargs[var]
     ws = kwargs['ws']
     for varValue in varValues.split(','):
-        if not (re.fullmatch(pattern,  varValue) and validators.length(
-            str(varValue), min=int(minimum), max=int(maximum))):
+        if not (rules.compiled().fullmatch(varValue) and minimum <= len(str(varValue)) <= maximum):
             print(f'\n-----------------------------------------------------------------------------\n')
             print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}. ')
             print(f'   "{varValue}" is an invalid Value...')
@@ -570,14 +683,14 @@ def string_list(var, jsonData, **kwargs):
 
 def string_pattern(var, jsonData, **kwargs):
     # Get Variables from Library
-    minimum = jsonData[var]['minimum']
-    maximum = jsonData[var]['maximum']
-    pattern = jsonData[var]['pattern']
+    rules = schema_rules(var, jsonData)
+    minimum = rules.minimum
+    maximum = rules.maximum
+    pattern = rules['pattern']
     row_num = kwargs['row_num']
     varValue = kwargs[var]
     ws = kwargs['ws']
-    if not (re.fullmatch(pattern,  varValue) and validators.length(
-        str(varValue), min=int(minimum), max=int(maximum))):
+    if not (rules.compiled().fullmatch(varValue) and minimum <= len(str(varValue)) <= maximum):
         print(f'\n-----------------------------------------------------------------------------\n')
         print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}. ')
         print(f'   "{varValue}" is an invalid Value...')
@@ -780,36 +893,10 @@ def vlans(var, **kwargs):
     row_num = kwargs['row_num']
     ws = kwargs['ws']
     varValue = kwargs[var]
-    if re.search(',', str(varValue)):
-        vlan_split = varValue.split(',')
-        for x in vlan_split:
-            if re.search('\\-', x):
-                dash_split = x.split('-')
-                for z in dash_split:
-                    if not validators.between(int(z), min=1, max=4095):
-                        print(f'\n-----------------------------------------------------------------------------\n')
-                        print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}. Valid VLAN Values are:')
-                        print(f'   between 1 and 4095.  "{z}" is not valid.  Exiting....')
-                        print(f'\n-----------------------------------------------------------------------------\n')
-                        exit()
-            elif not validators.between(int(x), min=1, max=4095):
-                print(f'\n-----------------------------------------------------------------------------\n')
-                print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}. Valid VLAN Values are:')
-                print(f'   between 1 and 4095.  "{x}" is not valid.  Exiting....')
-                print(f'\n-----------------------------------------------------------------------------\n')
-                exit()
-    elif re.search('\\-', str(varValue)):
-        dash_split = varValue.split('-')
-        for x in dash_split:
-            if not validators.between(int(x), min=1, max=4095):
-                print(f'\n-----------------------------------------------------------------------------\n')
-                print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}. Valid VLAN Values are:')
-                print(f'   between 1 and 4095.  "{x}" is not valid.  Exiting....')
-                print(f'\n-----------------------------------------------------------------------------\n')
-                exit()
-    elif not validators.between(int(varValue), min=1, max=4095):
+    invalid = check_vlans(varValue)
+    if not invalid == None:
         print(f'\n-----------------------------------------------------------------------------\n')
         print(f'   Error on Worksheet {ws.title}, Row {row_num} {var}. Valid VLAN Values are:')
-        print(f'   between 1 and 4095.  "{varValue}" is not valid.  Exiting....')
+        print(f'   between 1 and 4095.  "{invalid}" is not valid.  Exiting....')
         print(f'\n-----------------------------------------------------------------------------\n')
         exit()